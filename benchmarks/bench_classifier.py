@@ -0,0 +1,54 @@
+"""
+Compare classifying every element of the fixture language sections with the precompiled
+HeaderClassifier against the previous approach of searching each element for matching spans.
+
+    python -m benchmarks.bench_classifier
+"""
+import re
+import time
+
+from scraper.language import get_language, language_names
+from scraper.scraper import parse_html, slice_language_section
+from tests.mock import fixture_cases, fixture_html
+
+
+def classify_by_search(node, language, etymology_pattern):
+    is_pronunciation = bool(node.find_all('span', string=language.pronunciation))
+    is_etymology = bool(node.find_all('span', string=etymology_pattern))
+    additional_data = []
+    if node.name in ['h3', 'h4', 'h5']:
+        for response_field, html_id in language.additional_data.items():
+            if node.find(id=lambda x: x and x.startswith(html_id)):
+                additional_data.append(response_field)
+    return is_pronunciation, is_etymology, additional_data
+
+
+def best_time(function, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f'{"word":<24} {"elements":>8} {"search us":>10} {"classifier us":>14}')
+    for from_language, to_language, word in fixture_cases:
+        html = fixture_html(to_language, word)
+        name = language_names[to_language][from_language]
+        section = slice_language_section(html, name)
+        if section is None:
+            continue
+        root = parse_html(section)
+        nodes = [root.find(id=name).parent] + root.find(id=name).parent.find_next_siblings()
+        language = get_language(to_language)
+        etymology_pattern = re.compile(language.etymology + '.*')
+        search_time = best_time(lambda: [classify_by_search(node, language, etymology_pattern) for node in nodes])
+        classifier_time = best_time(lambda: [language.header_classifier.classify(node) for node in nodes])
+        print(f'{from_language}-{to_language} {word:<18} {len(nodes):>8} '
+              f'{search_time * 1e6:>10.0f} {classifier_time * 1e6:>14.0f}')
+
+
+if __name__ == '__main__':
+    main()
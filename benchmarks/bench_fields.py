@@ -0,0 +1,37 @@
+"""
+Compare scraping the fixture and synthetic pages for all fields against a definitions-only profile.
+
+    python -m benchmarks.bench_fields
+"""
+import argparse
+from typing import List
+
+from benchmarks.run import fixture_pages, measure, synthetic_pages
+
+PROFILES = {
+    'all': None,
+    'definitions': {'definitions', 'part_of_speech'},
+}
+
+
+def main(args: List[str] = None):
+    parser = argparse.ArgumentParser(description='Compare extracting all fields against a definitions-only profile.')
+    parser.add_argument('--repeat', type=int, default=5, help='Take the best time of this many runs')
+    options = parser.parse_args(args)
+
+    print(f'{"page":<32} ' + ' '.join(f'{profile + " ms":>16}' for profile in PROFILES) + f' {"saved":>7}')
+    totals = {profile: 0.0 for profile in PROFILES}
+    for name, from_language, to_language, word, html in list(fixture_pages()) + list(synthetic_pages()):
+        times = {}
+        for profile, fields in PROFILES.items():
+            result = measure(from_language, to_language, word, html, options.repeat, fields=fields)
+            times[profile] = result['extraction_time']
+            totals[profile] += times[profile]
+        print(f'{name:<32} ' + ' '.join(f'{times[profile] * 1000:>16.2f}' for profile in PROFILES)
+              + f' {1 - times["definitions"] / times["all"]:>7.0%}')
+    print(f'{"total":<32} ' + ' '.join(f'{totals[profile] * 1000:>16.2f}' for profile in PROFILES)
+          + f' {1 - totals["definitions"] / totals["all"]:>7.0%}')
+
+
+if __name__ == '__main__':
+    main()
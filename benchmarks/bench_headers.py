@@ -0,0 +1,41 @@
+"""
+Scrape synthetic pages with a growing number of etymology and part of speech headers, to check that
+the time spent per header stays flat as entries get longer.
+
+    python -m benchmarks.bench_headers
+"""
+import time
+
+from benchmarks.synthetic import synthetic_page
+from scraper.scraper import Scraper, parse_html, slice_language_section
+
+SIZES = [50, 100, 200, 400, 800]
+
+
+def time_extraction(html: str, repeat: int = 3) -> float:
+    en_en = Scraper('en', 'en')
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        en_en.scrape_html('word', html)
+        best = min(best, time.perf_counter() - start)
+    parse_time = min(_time_parse(html) for _ in range(repeat))
+    return best - parse_time
+
+
+def _time_parse(html: str) -> float:
+    start = time.perf_counter()
+    parse_html(slice_language_section(html, 'English'))
+    return time.perf_counter() - start
+
+
+def main():
+    print(f'{"headers":>8} {"extraction ms":>14} {"us/header":>10}')
+    for size in SIZES:
+        headers = size * 2
+        extraction_time = time_extraction(synthetic_page('en', 'en', etymologies=size, parts_of_speech=size))
+        print(f'{headers:>8} {extraction_time * 1000:>14.1f} {extraction_time / headers * 1e6:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
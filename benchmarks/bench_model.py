@@ -0,0 +1,61 @@
+"""
+Compare the memory held by the scrape results of the fixture pages as response dicts and as typed WordResult records,
+scraping every page a number of times so that nothing is shared between the results.
+
+    python -m benchmarks.bench_model --copies 20
+"""
+import argparse
+import gc
+import tracemalloc
+from typing import Any, Dict, List
+
+from scraper.language import language_names
+from scraper.scraper import Scraper
+from tests.mock import fixture_cases, fixture_html
+
+
+def pages() -> List[Dict[str, Any]]:
+    results = []
+    for _, to_language, word in dict.fromkeys((None, to_language, word) for _, to_language, word in fixture_cases):
+        html = fixture_html(to_language, word)
+        for from_language in language_names[to_language]:
+            results.append({'from_language': from_language, 'to_language': to_language, 'word': word, 'html': html})
+    return results
+
+
+def held_memory(typed: bool, copies: int) -> Dict[str, int]:
+    """
+    The memory held by the results of scraping every page copies times, and the number of results.
+    """
+    scrapers = {}
+    results = []
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for _ in range(copies):
+            for page in pages():
+                key = (page['from_language'], page['to_language'])
+                if key not in scrapers:
+                    scrapers[key] = Scraper(*key, typed=typed)
+                results.append(scrapers[key].scrape_html(page['word'], page['html']))
+        gc.collect()
+        held, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'results': len(results), 'bytes': held}
+
+
+def main(args: List[str] = None):
+    parser = argparse.ArgumentParser(description='Compare the memory held by response dicts and WordResult records.')
+    parser.add_argument('--copies', type=int, default=10, help='The number of times every page is scraped')
+    options = parser.parse_args(args)
+
+    dicts = held_memory(False, options.copies)
+    records = held_memory(True, options.copies)
+    print(f'{"results":<10} {"dict KiB":>10} {"typed KiB":>10} {"saved":>7}')
+    print(f'{dicts["results"]:<10} {dicts["bytes"] / 1024:>10.0f} {records["bytes"] / 1024:>10.0f} '
+          f'{1 - records["bytes"] / dicts["bytes"]:>7.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Run the extraction over every fixture page and over synthetic pages scaled up for each language pair,
+measuring parse time, extraction time, peak memory and allocated memory blocks per word.
+Results are written as JSON, and can be compared against a saved baseline to fail on regressions.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --baseline baseline.json --threshold 0.25
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Tuple
+
+from benchmarks.synthetic import synthetic_page
+from scraper.language import language_names
+from scraper.scraper import Scraper, get_default_parser
+from tests.mock import fixture_cases, fixture_html
+
+# Metrics where a larger value is a regression
+METRICS = ['parse_time', 'extraction_time', 'peak_memory', 'allocated_blocks']
+
+SYNTHETIC_SIZES = [10, 100]
+
+
+def fixture_pages() -> Iterator[Tuple[str, str, str, str, str]]:
+    for from_language, to_language, word in fixture_cases:
+        html = fixture_html(to_language, word)
+        yield f'{from_language}-{to_language} {word}', from_language, to_language, word, html
+
+
+def synthetic_pages() -> Iterator[Tuple[str, str, str, str, str]]:
+    for to_language, names in language_names.items():
+        for from_language in names:
+            for size in SYNTHETIC_SIZES:
+                html = synthetic_page(from_language, to_language, etymologies=size, parts_of_speech=size)
+                yield f'{from_language}-{to_language} synthetic-{size}', from_language, to_language, 'word', html
+
+
+def measure(from_language: str,
+            to_language: str,
+            word: str,
+            html: str,
+            repeat: int = 5,
+            **kwargs) -> Dict[str, Any]:
+    """
+    Measure scraping a page. Keyword arguments are passed on to Scraper.
+    """
+    word_scraper = Scraper(from_language, to_language, **kwargs)
+    parse_time = float('inf')
+    extraction_time = float('inf')
+    root = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        root = word_scraper.parse(html)
+        parse_time = min(parse_time, time.perf_counter() - start)
+    # Extraction leaves the parsed tree untouched, so it is timed on the same tree every run
+    for _ in range(repeat):
+        start = time.perf_counter()
+        word_scraper.scrape_root(word, root)
+        extraction_time = min(extraction_time, time.perf_counter() - start)
+
+    # The garbage collector is paused so that the parse tree, which has reference cycles,
+    # is still counted in the allocated blocks at the end of the scrape
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        word_scraper.scrape_html(word, html)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    allocated_blocks = sum(max(stat.count_diff, 0) for stat in after.compare_to(before, 'filename'))
+    return {
+        'html_size': len(html),
+        'parse_time': parse_time,
+        'extraction_time': extraction_time,
+        'peak_memory': peak_memory,
+        'allocated_blocks': allocated_blocks,
+    }
+
+
+def run(repeat: int = 5, synthetic: bool = True) -> Dict[str, Any]:
+    pages = list(fixture_pages())
+    if synthetic:
+        pages += list(synthetic_pages())
+    return {
+        'metadata': {
+            'python': platform.python_version(),
+            'parser': get_default_parser(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': {name: measure(from_language, to_language, word, html, repeat)
+                    for name, from_language, to_language, word, html in pages},
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    List the metrics which got worse than the baseline by more than the threshold, a fraction of the baseline value.
+    """
+    regressions = []
+    for name, result in current['results'].items():
+        baseline_result = baseline['results'].get(name)
+        if baseline_result is None:
+            continue
+        for metric in METRICS:
+            if metric not in result or not baseline_result.get(metric):
+                continue
+            change = result[metric] / baseline_result[metric] - 1
+            if change > threshold:
+                regressions.append(f'{name} {metric}: {baseline_result[metric]:.6g} -> {result[metric]:.6g} '
+                                   f'(+{change:.0%})')
+    return regressions
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    print(f'{"page":<32} {"parse ms":>9} {"extract ms":>11} {"peak KiB":>9} {"blocks":>8}')
+    for name, result in results['results'].items():
+        print(f'{name:<32} {result["parse_time"] * 1000:>9.2f} {result["extraction_time"] * 1000:>11.2f} '
+              f'{result["peak_memory"] / 1024:>9.0f} {result["allocated_blocks"]:>8}')
+
+
+def main(args: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the extraction over the fixture and synthetic pages.')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--baseline', help='Compare the results against this JSON file of earlier results')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Fail if a metric is worse than the baseline by more than this fraction')
+    parser.add_argument('--repeat', type=int, default=5, help='Take the best time of this many runs')
+    parser.add_argument('--no-synthetic', action='store_true', help='Only benchmark the fixture pages')
+    options = parser.parse_args(args)
+
+    results = run(repeat=options.repeat, synthetic=not options.no_synthetic)
+    print_results(results)
+    if options.output:
+        with open(options.output, 'w') as output:
+            json.dump(results, output, indent=2)
+    if options.baseline:
+        with open(options.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), options.threshold)
+        for regression in regressions:
+            print(f'Regression: {regression}', file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,39 @@
+from scraper.language import get_language, language_names
+
+
+def synthetic_page(from_language: str, to_language: str, etymologies: int, parts_of_speech: int = 0,
+                   definitions: int = 3) -> str:
+    """
+    Build a page in the markup of Wiktionary with a section for from_language which has the given number of
+    etymology headers (each with a part of speech, definitions, examples and synonyms), followed by
+    part of speech headers without an etymology, and a section for another language after it.
+    """
+    language = get_language(to_language)
+    name = language_names[to_language][from_language]
+    other_name = next(other for code, other in language_names[to_language].items() if code != from_language)
+    parts = ['<html><body><div class="mw-parser-output">',
+             f'<h2><span class="mw-headline" id="{name}">{name}</span></h2>',
+             f'<h3><span class="mw-headline" id="{language.pronunciation}">{language.pronunciation}</span></h3>',
+             '<ul><li><span class="IPA">/wɜːd/</span></li></ul>']
+    for i in range(1, etymologies + 1):
+        parts.append(f'<h3><span class="mw-headline" id="{language.etymology}_{i}">'
+                     f'{language.etymology} {i}</span></h3>')
+        parts.append(f'<p>From origin {i}.</p>')
+        parts.append(f'<h4><span class="mw-headline" id="Noun_{i}">Noun</span></h4>')
+        parts.append(_meaning_values(i, definitions))
+    for i in range(1, parts_of_speech + 1):
+        parts.append(f'<h3><span class="mw-headline" id="Verb_{i}">Verb</span></h3>')
+        parts.append(_meaning_values(etymologies + i, definitions))
+    parts.append(f'<h2><span class="mw-headline" id="{other_name}">{other_name}</span></h2>')
+    parts.append(_meaning_values(0, definitions))
+    parts.append('</div></body></html>')
+    return '\n'.join(parts)
+
+
+def _meaning_values(index: int, definitions: int) -> str:
+    items = ''.join(f'<li>Definition {index}.{j}.<dl><dd><i>An example {index}.{j}.</i></dd></dl></li>'
+                    for j in range(definitions))
+    return (f'<p><strong>word</strong> (plural words {index})</p>'
+            f'<ol>{items}</ol>'
+            f'<h5><span class="mw-headline" id="Synonyms_{index}">Synonyms</span></h5>'
+            f'<ul><li>synonym {index}</li></ul>')
@@ -1 +1,13 @@
-from .scraper import Scraper, scrape
+from .scraper import Scraper, error_response, scrape, scrape_html, scrape_many
+from .cache import HttpCache
+from .result_cache import ResultCache
+from .transport import (CircuitOpenError, FetchError, NO_RETRY, PageNotFoundError, RetryPolicy, Transport,
+                        TransientError)
+from .async_scraper import AsyncScraper, ascrape_many
+from .pipeline import ParserPool, parse_many
+from .dump import ingest_dump, read_dump, scrape_dump
+from .writers import ColumnarWriter, JsonLinesWriter, write_responses
+from .instrumentation import Hook, Instrumentation, MetricsAggregator
+from .model import Definition, Example, Meaning, Pronunciation, PronunciationValue, Translation, WordResult
+from .multi_language import MultiLanguageScraper, scrape_languages
+from .translations import iter_translations, scrape_translations
@@ -0,0 +1,106 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Set
+
+from scraper.scraper import Scraper, error_response, scrape_html
+from scraper.transport import Transport
+
+
+class AsyncScraper:
+
+    def __init__(self,
+                 from_language: str = 'en',
+                 to_language: str = 'en',
+                 concurrency: int = 10,
+                 requests_per_second: Optional[float] = None,
+                 transport: Optional[Transport] = None,
+                 parse_executor: Optional[Executor] = None,
+                 base_url: Optional[str] = None):
+        """
+        :param from_language: The 2-character representation of the input language (en, tr etc.)
+        :param to_language: The 2-character representation of the language we are translating to (en, tr etc.)
+        :param concurrency: The maximum number of pages being downloaded at the same time
+        :param requests_per_second: The maximum number of requests sent to a single wiki host per second,
+        for the transport created if none is given. A given transport applies its own limit.
+        :param transport: The HTTP transport used to fetch pages. One sized for the concurrency is created if not given.
+        :param parse_executor: The executor pages are parsed in, so that parsing does not block the event loop.
+        A ProcessPoolExecutor can be given to parse on several cores. A single worker thread is used if not given.
+        :param base_url: The wiki to fetch pages from. Defaults to https://<to_language>.wiktionary.org
+        """
+        self._from_language = from_language
+        self._to_language = to_language
+        self._concurrency = concurrency
+        if transport is not None and requests_per_second:
+            raise ValueError('Pass requests_per_second to the given transport instead')
+        self._owns_transport = transport is None
+        self._transport = transport or Transport(pool_size=concurrency, requests_per_second=requests_per_second)
+        self._scraper = Scraper(from_language, to_language, transport=self._transport, base_url=base_url)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._fetch_executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='wkt-fetch')
+        self._owns_parse_executor = parse_executor is None
+        self._parse_executor = parse_executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix='wkt-parse')
+
+    async def scrape(self, word: str) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            # The transport spaces out the requests to each host in the fetch threads
+            html = await loop.run_in_executor(self._fetch_executor, self._scraper.fetch_html, word)
+        return await loop.run_in_executor(
+            self._parse_executor, scrape_html, self._from_language, self._to_language, word, html)
+
+    async def _scrape_or_error(self, word: str) -> Dict[str, Any]:
+        try:
+            return await self.scrape(word)
+        except FileNotFoundError as e:
+            return error_response(self._from_language, self._to_language, word, e)
+
+    async def scrape_many(self, words: Iterable[str], return_errors: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Scrape the given words concurrently, yielding the responses in the order they complete.
+        Only a bounded number of words is in flight at any time, so the words can be a long lazy iterable.
+        If return_errors is set, a word which could not be fetched yields an error response instead of ending
+        the batch, see error_response.
+        """
+        scrape = self._scrape_or_error if return_errors else self.scrape
+        pending: Set[asyncio.Task] = set()
+        try:
+            for word in words:
+                pending.add(asyncio.ensure_future(scrape(word)))
+                if len(pending) >= self._concurrency * 2:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def close(self) -> None:
+        self._fetch_executor.shutdown(wait=False)
+        if self._owns_parse_executor:
+            self._parse_executor.shutdown(wait=False)
+        if self._owns_transport:
+            self._transport.close()
+
+    async def __aenter__(self) -> 'AsyncScraper':
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        self.close()
+
+
+async def ascrape_many(from_language: str,
+                       to_language: str,
+                       words: Iterable[str],
+                       return_errors: bool = False,
+                       **kwargs) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Scrape the given words concurrently, yielding the responses in the order they complete.
+    See AsyncScraper.scrape_many for return_errors. Other keyword arguments are passed on to AsyncScraper.
+    """
+    async with AsyncScraper(from_language, to_language, **kwargs) as async_scraper:
+        async for response in async_scraper.scrape_many(words, return_errors):
+            yield response
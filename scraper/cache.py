@@ -0,0 +1,149 @@
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Union
+
+# The number of least recently used entries read at once while evicting
+EVICTION_BATCH_SIZE = 100
+
+
+class CacheEntry(NamedTuple):
+    html: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+
+class HttpCache:
+    """
+    A persistent cache of downloaded pages, stored compressed in a SQLite database and keyed by URL.
+    Entries younger than the TTL are served without network access. Older entries are revalidated with a
+    conditional request using their ETag and Last-Modified headers.
+    """
+
+    def __init__(self, path: Union[str, Path], ttl: float = 24 * 60 * 60, max_size: Optional[int] = None):
+        """
+        :param path: The SQLite database file. It is created if it does not exist.
+        :param ttl: Seconds an entry is served without revalidation
+        :param max_size: The maximum total size of the compressed pages in bytes.
+        Least recently used entries are evicted when it is exceeded. Unlimited if not given.
+        The total size is read when the cache is opened and then kept up to date by this instance, so a database
+        should not be written to by several processes at once if max_size is set.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('''
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                html BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )''')
+        self._connection.execute('CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)')
+        # Running total of the sizes of the entries, so that storing a page does not have to sum up the whole table
+        self._size = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT html, etag, last_modified, fetched_at FROM pages WHERE url = ?', (url,)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute('UPDATE pages SET accessed_at = ? WHERE url = ?', (time.time(), url))
+        html, etag, last_modified, fetched_at = row
+        return CacheEntry(zlib.decompress(html).decode('utf-8'), etag, last_modified, fetched_at)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.fetched_at < self.ttl
+
+    def record(self, event: str) -> None:
+        """
+        Count a cache lookup outcome, one of hits, misses or revalidations.
+        """
+        with self._lock:
+            setattr(self, event, getattr(self, event) + 1)
+
+    def put(self, url: str, html: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        compressed = zlib.compress(html.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            replaced = self._connection.execute('SELECT size FROM pages WHERE url = ?', (url,)).fetchone()
+            self._connection.execute(
+                'INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (url, compressed, etag, last_modified, now, now, len(compressed)))
+            self._size += len(compressed) - (replaced[0] if replaced else 0)
+            if self.max_size is not None:
+                self._evict(self.max_size)
+
+    def refresh(self, url: str) -> None:
+        """
+        Mark the entry as fresh again after the server confirmed that it has not been modified.
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute('UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?', (now, now, url))
+
+    def evict(self, max_size: int) -> int:
+        """
+        Remove least recently used entries until the total size is at most max_size bytes.
+        Returns the number of removed entries.
+        """
+        with self._lock:
+            return self._evict(max_size)
+
+    def _evict(self, max_size: int) -> int:
+        evicted = 0
+        while self._size > max_size:
+            # The least recently used entries are read a batch at a time from the accessed_at index
+            rows = self._connection.execute('SELECT url, size FROM pages ORDER BY accessed_at, rowid LIMIT ?',
+                                            (EVICTION_BATCH_SIZE,)).fetchall()
+            if not rows:
+                self._size = 0
+                break
+            for url, size in rows:
+                if self._size <= max_size:
+                    break
+                self._connection.execute('DELETE FROM pages WHERE url = ?', (url,))
+                self._size -= size
+                evicted += 1
+        self.evictions += evicted
+        return evicted
+
+    def size(self) -> int:
+        with self._lock:
+            return self._size
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidations': self.revalidations,
+            'evictions': self.evictions,
+            'entries': len(self),
+            'size': self.size(),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute('DELETE FROM pages')
+            self._size = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,220 @@
+"""
+Scrape words listed in a file or on the standard input into JSON lines.
+
+    wkt-scraper en en words.txt --output words.jsonl --concurrency 8
+
+Words which are done are recorded in a checkpoint journal next to the output, so that a run which was stopped
+continues where it stopped when it is started again with the same arguments.
+"""
+import argparse
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+
+from scraper.scraper import (FETCH_MODES, REDIRECT_PAGES_SIZE, PageNotFoundError, Scraper, error_response,
+                             mark_redirect_targets)
+from scraper.transport import RetryPolicy, Transport
+from scraper.writers import JsonLinesWriter
+
+
+class Checkpoint:
+    """
+    An append-only journal of the words which are done. Words are only journaled after their responses were written,
+    so a stopped run may write a response again but never loses one.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.words: Set[str] = set()
+        if path.exists():
+            with open(path, encoding='utf-8') as journal:
+                self.words = {line.rstrip('\n') for line in journal if line.strip()}
+        self._journal = open(path, 'a', encoding='utf-8')
+
+    def add(self, words: Iterable[str]) -> None:
+        self._journal.writelines(f'{word}\n' for word in words)
+        self._journal.flush()
+
+    def close(self) -> None:
+        self._journal.close()
+
+
+class Progress:
+    """
+    Reports the number of done words, the rate and the number of errors every interval seconds.
+    """
+
+    def __init__(self, output: TextIO, interval: float = 10.0):
+        self._output = output
+        self._interval = interval
+        self._start = time.monotonic()
+        self._reported_at = self._start
+        self.done = 0
+        self.not_found = 0
+        self.errors = 0
+
+    def update(self, response: Dict[str, Any]) -> None:
+        self.done += 1
+        error = response.get('error')
+        if error == 'not_found':
+            self.not_found += 1
+        elif error is not None:
+            self.errors += 1
+        now = time.monotonic()
+        if self._interval and now - self._reported_at >= self._interval:
+            self._reported_at = now
+            self.report()
+
+    def report(self) -> None:
+        elapsed = time.monotonic() - self._start
+        rate = self.done / elapsed if elapsed else 0.0
+        print(f'{self.done} words, {rate:.1f} words/s, {self.not_found} not found, {self.errors} errors',
+              file=self._output, flush=True)
+
+
+def read_words(input_file: TextIO) -> Iterator[str]:
+    for line in input_file:
+        word = line.strip()
+        if word:
+            yield word
+
+
+def scrape_concurrently(from_language: str,
+                        to_language: str,
+                        words: Iterable[str],
+                        concurrency: int,
+                        preflight: bool = False,
+                        **kwargs) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Scrape the words in concurrency threads, yielding (word, response) pairs in the order they complete.
+    A word which fails yields an error response, see error_response. Keyword arguments are passed on to Scraper.
+    With preflight, a page which words redirect to is scraped once for all of them, see scrape_many.
+    """
+    word_scraper = Scraper(from_language, to_language, **kwargs)
+    if preflight:
+        titles = mark_redirect_targets(word_scraper.resolve_titles(words))
+    else:
+        titles = ((word, word, False) for word in words)
+
+    def scrape_title(word: str, title: Optional[str], page: Optional[Future]) -> Tuple[str, Dict[str, Any]]:
+        try:
+            if title is None:
+                raise PageNotFoundError(f'No page for {word}', word_scraper._get_url(word))
+            if page is None:
+                return word, word_scraper.scrape(title)
+            response = dict(page.result())
+            if title != word:
+                response['redirected_from'] = word
+            return word, response
+        except Exception as e:
+            return word, error_response(from_language, to_language, word, e)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='wkt-scrape') as executor:
+        pending: Set[Future] = set()
+        # Scrapes of the pages which words redirect to, by title, least recently used first. They are submitted
+        # ahead of the words which wait for them, so a free worker always picks them up first. Only the last
+        # REDIRECT_PAGES_SIZE titles are kept, the words holding a dropped future still get its response.
+        pages: OrderedDict[str, Future] = OrderedDict()
+        for word, title, is_target in titles:
+            page = None
+            if is_target:
+                page = pages.get(title)
+                if page is None:
+                    page = pages[title] = executor.submit(word_scraper.scrape, title)
+                    if len(pages) > REDIRECT_PAGES_SIZE:
+                        pages.popitem(last=False)
+                else:
+                    pages.move_to_end(title)
+            pending.add(executor.submit(scrape_title, word, title, page))
+            if len(pending) >= concurrency * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def parse_args(args: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='wkt-scraper', description='Scrape words from Wiktionary into JSON lines.')
+    parser.add_argument('from_language', help='The 2-character code of the language of the words (en, tr etc.)')
+    parser.add_argument('to_language', help='The 2-character code of the language of the wiki (en, tr etc.)')
+    parser.add_argument('input', nargs='?', default='-', help='A file with one word per line, - for standard input')
+    parser.add_argument('-o', '--output', default='-',
+                        help='The JSON lines file, compressed if it ends with .gz or .zst, - for standard output')
+    parser.add_argument('-c', '--concurrency', type=int, default=4, help='The number of words scraped at once')
+    parser.add_argument('--checkpoint',
+                        help='The checkpoint journal. Defaults to the output file with a .checkpoint extension.')
+    parser.add_argument('--checkpoint-every', type=int, default=100,
+                        help='The number of words written out before they are journaled')
+    parser.add_argument('--skip-errors', action='store_true',
+                        help='Do not write the not_found responses of words without a page. Words which failed '
+                             'are only reported and never written, since they are tried again when the run is '
+                             'resumed.')
+    parser.add_argument('--preflight', action='store_true',
+                        help='Resolve the words in batches first, skipping missing ones and following redirects')
+    parser.add_argument('--fetch-mode', choices=FETCH_MODES, default='page', help='How pages are fetched')
+    parser.add_argument('--requests-per-second', type=float, help='The maximum request rate to the wiki')
+    parser.add_argument('--retries', type=int, default=3, help='The number of retries of failed requests')
+    parser.add_argument('--base-url', help='The wiki to fetch pages from')
+    parser.add_argument('--progress-interval', type=float, default=10.0,
+                        help='Seconds between progress reports on the standard error, 0 to disable')
+    return parser.parse_args(args)
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    options = parse_args(args)
+    checkpoint = None
+    if options.checkpoint:
+        checkpoint = Checkpoint(Path(options.checkpoint))
+    elif options.output != '-':
+        checkpoint = Checkpoint(Path(f'{options.output}.checkpoint'))
+    completed = checkpoint.words if checkpoint is not None else set()
+
+    input_file = sys.stdin if options.input == '-' else open(options.input, encoding='utf-8')
+    output = sys.stdout if options.output == '-' else options.output
+    transport = Transport(pool_size=options.concurrency,
+                          retry=RetryPolicy(retries=options.retries),
+                          requests_per_second=options.requests_per_second)
+    progress = Progress(sys.stderr, options.progress_interval)
+    batch: List[str] = []
+    try:
+        with JsonLinesWriter(output, batch_size=options.checkpoint_every, append=bool(completed)) as writer:
+            words = (word for word in read_words(input_file) if word not in completed)
+            responses = scrape_concurrently(options.from_language, options.to_language, words, options.concurrency,
+                                            options.preflight, transport=transport, base_url=options.base_url,
+                                            fetch_mode=options.fetch_mode)
+            for word, response in responses:
+                progress.update(response)
+                error = response.get('error')
+                if error in [None, 'not_found']:
+                    batch.append(word)
+                    if error is None or not options.skip_errors:
+                        writer.write(response)
+                else:
+                    # Failed words are not journaled, writing them would leave a stale record once they are retried
+                    print(f'{word}: {response["message"]}', file=sys.stderr)
+                if checkpoint is not None and len(batch) >= options.checkpoint_every:
+                    writer.flush()
+                    checkpoint.add(batch)
+                    batch = []
+            writer.flush()
+            if checkpoint is not None:
+                checkpoint.add(batch)
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+        if input_file is not sys.stdin:
+            input_file.close()
+        transport.close()
+    if options.progress_interval:
+        progress.report()
+    return 1 if progress.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
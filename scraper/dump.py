@@ -0,0 +1,88 @@
+import bz2
+import gzip
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, TextIO, Tuple, Union
+
+from scraper.language import language_names
+from scraper.pipeline import ParserPool
+from scraper.scraper import Scraper
+from scraper.writers import JsonLinesWriter, write_responses
+
+# Parsoid markup, which the dumps are rendered in, wraps every section in a section element and puts the id of a
+# header on the h tag itself instead of on its mw-headline span
+_SECTION_TAG = re.compile(r'</?section\b[^>]*>')
+_PARSOID_HEADER = re.compile(r'<h([2-6])\b([^>]*?)\s+id="([^"]*)"([^>]*)>(.*?)</h\1\s*>', re.S)
+
+
+def open_dump(path: Union[str, Path]) -> TextIO:
+    path = str(path)
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if path.endswith('.bz2'):
+        return bz2.open(path, 'rt', encoding='utf-8')
+    return open(path, 'rt', encoding='utf-8')
+
+
+def read_dump(path: Union[str, Path]) -> Iterator[Tuple[str, str]]:
+    """
+    Stream (title, html) pairs from a Wikimedia Enterprise HTML dump, which has one JSON article per line.
+    The dump can be gzip or bz2 compressed, which is detected from the file extension.
+    """
+    with open_dump(path) as dump:
+        for line in dump:
+            if not line.strip():
+                continue
+            article = json.loads(line)
+            yield article['name'], article['article_body']['html']
+
+
+def to_legacy_markup(html: str) -> str:
+    """
+    Rewrite a page in Parsoid markup into the markup of pages served by the wiki, which the scraper reads:
+    the section elements are unwrapped so that the headers and their content are siblings again, and the ids of
+    headers are moved to an mw-headline span. Pages already in that markup are returned unchanged.
+    """
+    if '<section' not in html:
+        return html
+    html = _SECTION_TAG.sub('', html)
+    return _PARSOID_HEADER.sub(r'<h\1\2\4><span class="mw-headline" id="\3">\5</span></h\1>', html)
+
+
+def scrape_dump(from_language: str,
+                to_language: str,
+                path: Union[str, Path],
+                workers: Optional[int] = None,
+                chunk_size: int = 16) -> Iterator[Dict[str, Any]]:
+    """
+    Scrape every article of a Wiktionary HTML dump which has a section for from_language, one article at a time.
+    Articles in Parsoid markup, as in Wikimedia Enterprise dumps, are rewritten with to_legacy_markup first.
+    :param from_language: The 2-character representation of the input language (en, tr etc.)
+    :param to_language: The 2-character representation of the language of the wiki the dump is taken from
+    :param path: The dump file
+    :param workers: If given, articles are parsed in this many worker processes, with a bounded number in flight
+    :param chunk_size: The number of articles sent to a worker process at once
+    """
+    label = f'id="{language_names[to_language][from_language]}"'
+    pages = ((title, to_legacy_markup(html)) for title, html in read_dump(path) if label in html)
+    if workers:
+        with ParserPool(from_language, to_language, workers=workers, chunk_size=chunk_size) as pool:
+            yield from pool.map(pages)
+    else:
+        dump_scraper = Scraper(from_language, to_language)
+        for title, html in pages:
+            yield dump_scraper.scrape_html(title, html)
+
+
+def ingest_dump(from_language: str,
+                to_language: str,
+                path: Union[str, Path],
+                output: TextIO,
+                workers: Optional[int] = None) -> int:
+    """
+    Scrape a Wiktionary HTML dump and write the responses to output as JSON lines as they are produced.
+    Returns the number of written responses.
+    """
+    with JsonLinesWriter(output) as writer:
+        return write_responses(scrape_dump(from_language, to_language, path, workers=workers), writer)
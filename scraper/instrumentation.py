@@ -0,0 +1,135 @@
+import json
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+
+class Hook:
+    """
+    Receives the timings and counters of scrapes. Override the methods you are interested in.
+    """
+
+    def on_timing(self, stage: str, seconds: float) -> None:
+        pass
+
+    def on_count(self, counter: str, value: int) -> None:
+        pass
+
+
+class _Timer:
+    __slots__ = ['_instrumentation', '_stage', '_start']
+
+    def __init__(self, instrumentation: 'Instrumentation', stage: str):
+        self._instrumentation = instrumentation
+        self._stage = stage
+        self._start = 0.0
+
+    def __enter__(self) -> '_Timer':
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self._instrumentation.timing(self._stage, time.perf_counter() - self._start)
+
+
+class _NullTimer:
+    __slots__ = []
+
+    def __enter__(self) -> '_NullTimer':
+        return self
+
+    def __exit__(self, *_) -> None:
+        pass
+
+
+_null_timer = _NullTimer()
+
+
+class Instrumentation:
+    """
+    Times the stages of scrapes and counts what they process, passing the measurements on to hooks.
+    Without hooks it is disabled and costs next to nothing.
+
+    Stages are fetch and decode (timed by Transport), prune, parse, section_walk and the _process_* steps of
+    the extraction (timed by Scraper). Stages can be nested, process_meaning_values runs within process_header.
+    Counters are bytes_fetched, retries, nodes_parsed and definitions_found.
+    """
+
+    def __init__(self, hooks: Iterable[Hook] = ()):
+        self.hooks: List[Hook] = list(hooks)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.hooks)
+
+    def timed(self, stage: str):
+        """
+        A context manager which times its body as the given stage.
+        """
+        if not self.hooks:
+            return _null_timer
+        return _Timer(self, stage)
+
+    def timing(self, stage: str, seconds: float) -> None:
+        for hook in self.hooks:
+            hook.on_timing(stage, seconds)
+
+    def count(self, counter: str, value: int = 1) -> None:
+        for hook in self.hooks:
+            hook.on_count(counter, value)
+
+
+DISABLED = Instrumentation()
+
+
+class MetricsAggregator(Hook):
+    """
+    A thread-safe hook which sums up timings per stage and counters, exported as JSON or Prometheus text.
+    """
+
+    def __init__(self, prefix: str = 'wkt_scraper'):
+        self._prefix = prefix
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def on_timing(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            timing = self._timings.get(stage)
+            if timing is None:
+                self._timings[stage] = {'count': 1, 'sum': seconds, 'min': seconds, 'max': seconds}
+            else:
+                timing['count'] += 1
+                timing['sum'] += seconds
+                timing['min'] = min(timing['min'], seconds)
+                timing['max'] = max(timing['max'], seconds)
+
+    def on_count(self, counter: str, value: int) -> None:
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + value
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                'timings': {stage: dict(timing) for stage, timing in self._timings.items()},
+                'counters': dict(self._counters),
+            }
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self) -> str:
+        snapshot = self.snapshot()
+        lines = [f'# TYPE {self._prefix}_stage_seconds summary']
+        for stage, timing in sorted(snapshot['timings'].items()):
+            lines.append(f'{self._prefix}_stage_seconds_sum{{stage="{stage}"}} {timing["sum"]!r}')
+            lines.append(f'{self._prefix}_stage_seconds_count{{stage="{stage}"}} {timing["count"]}')
+        for counter, value in sorted(snapshot['counters'].items()):
+            lines.append(f'# TYPE {self._prefix}_{counter}_total counter')
+            lines.append(f'{self._prefix}_{counter}_total {value}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        with self._lock:
+            self._timings.clear()
+            self._counters.clear()
@@ -1,4 +1,54 @@
-from typing import Dict
+from typing import Dict, List, NamedTuple, Tuple
+
+HEADER_TAGS = ['h2', 'h3', 'h4', 'h5', 'h6']
+
+
+class HeaderClass(NamedTuple):
+    is_pronunciation: bool
+    is_etymology: bool
+    # Names of the response fields the header introduces a list of terms for
+    additional_data: Tuple[str, ...]
+
+
+NOT_A_HEADER = HeaderClass(False, False, ())
+
+
+class HeaderClassifier:
+    """
+    Tells what a section header of a Wiktionary in this language is about, from the texts and ids of its spans.
+    """
+
+    def __init__(self, pronunciation: str, etymology: str, additional_data: Dict[str, str]):
+        """
+        :param pronunciation: The text of pronunciation headers
+        :param etymology: The text etymology headers start with, they may be numbered (Etymology 1, Etymology 2)
+        :param additional_data: Key is the name of field in response. Value is the prefix of the header span id.
+        """
+        self._pronunciation = pronunciation
+        self._etymology = etymology
+        self._additional_data: List[Tuple[str, str]] = list(additional_data.items())
+        self._id_prefixes = tuple(html_id for _, html_id in self._additional_data)
+
+    def classify(self, header) -> HeaderClass:
+        if header.name not in HEADER_TAGS:
+            return NOT_A_HEADER
+        is_pronunciation = False
+        is_etymology = False
+        for span in header.find_all('span'):
+            text = span.string
+            if text is not None:
+                is_pronunciation = is_pronunciation or text == self._pronunciation
+                is_etymology = is_etymology or self._etymology in text
+        additional_data = ()
+        if header.name in ['h3', 'h4', 'h5']:
+            ids = [tag['id'] for tag in header.find_all(id=self._has_additional_data_id)]
+            if ids:
+                additional_data = tuple(response_field for response_field, html_id in self._additional_data
+                                        if any(tag_id.startswith(html_id) for tag_id in ids))
+        return HeaderClass(is_pronunciation, is_etymology, additional_data)
+
+    def _has_additional_data_id(self, tag_id) -> bool:
+        return tag_id is not None and tag_id.startswith(self._id_prefixes)
 
 
 class Language:
@@ -9,6 +59,16 @@ class Language:
         self.pronunciation = pronunciation
         self.derived_terms = kwargs['derived_terms']
         self.proverbs = kwargs['proverbs']
+        # Key is the name of field in response. Value is the HTML element ID on the Wiktionary page
+        self.additional_data = {
+            'see_also': 'See_also',
+            'related_terms': 'Related_terms',
+            'synonyms': 'Synonyms',
+            'antonyms': 'Antonyms',
+            'proverbs': self.proverbs,
+            'derived_terms': self.derived_terms,
+        }
+        self.header_classifier = HeaderClassifier(pronunciation, etymology, self.additional_data)
 
 
 languages: Dict[str, Language] = {
@@ -0,0 +1,122 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Lists of terms which may be present in a meaning, see Language.additional_data
+MEANING_LIST_FIELDS = ['see_also', 'related_terms', 'synonyms', 'antonyms', 'proverbs', 'derived_terms']
+
+
+@dataclass(slots=True)
+class Example:
+    example: Optional[str] = None
+    translation: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'example': self.example, 'translation': self.translation}
+
+
+@dataclass(slots=True)
+class Definition:
+    text: str
+    examples: List[Example] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'text': self.text, 'examples': [example.to_dict() for example in self.examples]}
+
+
+@dataclass(slots=True)
+class PronunciationValue:
+    type: str
+    value: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'type': self.type, 'value': self.value}
+
+
+@dataclass(slots=True)
+class Pronunciation:
+    type: str
+    values: List[PronunciationValue] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'type': self.type, 'values': [value.to_dict() for value in self.values]}
+
+
+@dataclass(slots=True)
+class Meaning:
+    """
+    A meaning of a word. Fields which were not found on the page are None and left out of the dict.
+    """
+    etymology: Optional[str] = None
+    definitions: List[Definition] = field(default_factory=list)
+    part_of_speech: Optional[str] = None
+    metadata: Optional[str] = None
+    see_also: Optional[List[str]] = None
+    related_terms: Optional[List[str]] = None
+    synonyms: Optional[List[str]] = None
+    antonyms: Optional[List[str]] = None
+    proverbs: Optional[List[str]] = None
+    derived_terms: Optional[List[str]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {'etymology': self.etymology, 'definitions': [definition.to_dict() for definition in self.definitions]}
+        if self.part_of_speech is not None:
+            result['part_of_speech'] = self.part_of_speech
+        if self.metadata is not None:
+            result['metadata'] = self.metadata
+        for name in MEANING_LIST_FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                result[name] = value
+        return result
+
+
+@dataclass(slots=True)
+class WordResult:
+    """
+    The word data scraped from a page, a compact alternative to the response dict which to_dict() converts to.
+    """
+    word: str
+    from_language: str
+    to_language: str
+    meanings: List[Meaning] = field(default_factory=list)
+    pronunciation: Optional[List[Pronunciation]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            'word': self.word,
+            'from_language': self.from_language,
+            'to_language': self.to_language,
+            'meanings': [meaning.to_dict() for meaning in self.meanings],
+        }
+        if self.pronunciation is not None:
+            result['pronunciation'] = [pronunciation.to_dict() for pronunciation in self.pronunciation]
+        return result
+
+
+@dataclass(slots=True)
+class Translation:
+    """
+    A row of a translations table: a term in another language for a sense of the word.
+    """
+    language: str
+    language_code: str
+    term: str
+    sense: Optional[str] = None
+    part_of_speech: Optional[str] = None
+    transliteration: Optional[str] = None
+    gender: Optional[str] = None
+    qualifier: Optional[str] = None
+    gloss: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'language': self.language,
+            'language_code': self.language_code,
+            'term': self.term,
+            'sense': self.sense,
+            'part_of_speech': self.part_of_speech,
+            'transliteration': self.transliteration,
+            'gender': self.gender,
+            'qualifier': self.qualifier,
+            'gloss': self.gloss,
+        }
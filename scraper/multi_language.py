@@ -0,0 +1,60 @@
+from typing import Any, Dict, Iterable, Optional, Union
+
+from scraper.language import language_names
+from scraper.model import WordResult
+from scraper.scraper import Scraper, slice_language_section
+
+
+class MultiLanguageScraper:
+    """
+    Scrapes the sections of several source languages out of a single fetch of a page of a wiki,
+    parsing only the section of each language.
+    """
+
+    def __init__(self, to_language: str = 'en', from_languages: Optional[Iterable[str]] = None, **kwargs):
+        """
+        :param to_language: The 2-character representation of the language of the wiki (en, tr etc.)
+        :param from_languages: The 2-character representations of the source languages to scrape.
+        Every supported language whose section is on the page is scraped if not given.
+        Keyword arguments are passed on to the Scraper of every source language.
+        """
+        self._explicit = from_languages is not None
+        if from_languages is None:
+            from_languages = language_names[to_language]
+        self._scrapers = {from_language: Scraper(from_language, to_language, **kwargs)
+                          for from_language in from_languages}
+        self._names = {from_language: language_names[to_language][from_language]
+                       for from_language in self._scrapers}
+
+    def scrape(self, word: str) -> Dict[str, Union[Dict[str, Any], WordResult]]:
+        """
+        Fetch the page of the word once and scrape it for every source language, keyed by the language.
+        """
+        page_scraper = next(iter(self._scrapers.values()))
+        return self.scrape_html(word, page_scraper.fetch_page(word))
+
+    def scrape_html(self, word: str, html: str) -> Dict[str, Union[Dict[str, Any], WordResult]]:
+        """
+        Scrape an already fetched page for every source language. Languages which were not asked for explicitly
+        are left out if the page has no section for them.
+        """
+        results = {}
+        for from_language, word_scraper in self._scrapers.items():
+            section = slice_language_section(html, self._names[from_language])
+            if section is None:
+                if not self._explicit:
+                    continue
+                # Without a section there is nothing to extract, which gives an empty result
+                section = ''
+            results[from_language] = word_scraper.scrape_html(word, section)
+        return results
+
+
+def scrape_languages(to_language: str,
+                     word: str,
+                     from_languages: Optional[Iterable[str]] = None,
+                     **kwargs) -> Dict[str, Union[Dict[str, Any], WordResult]]:
+    """
+    Scrape a word for several source languages with a single fetch of its page, see MultiLanguageScraper.
+    """
+    return MultiLanguageScraper(to_language, from_languages, **kwargs).scrape(word)
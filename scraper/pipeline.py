@@ -0,0 +1,78 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from scraper.scraper import scrape_html
+
+Page = Tuple[str, str]
+
+
+def _scrape_chunk(from_language: str, to_language: str, pages: List[Page]) -> List[Dict[str, Any]]:
+    return [scrape_html(from_language, to_language, word, html) for word, html in pages]
+
+
+class ParserPool:
+    """
+    Extracts word data from already downloaded pages in a pool of worker processes.
+    """
+
+    def __init__(self,
+                 from_language: str = 'en',
+                 to_language: str = 'en',
+                 workers: Optional[int] = None,
+                 chunk_size: int = 16,
+                 max_pending_chunks: Optional[int] = None):
+        """
+        :param from_language: The 2-character representation of the input language (en, tr etc.)
+        :param to_language: The 2-character representation of the language we are translating to (en, tr etc.)
+        :param workers: The number of worker processes. Defaults to the number of CPUs.
+        :param chunk_size: The number of pages sent to a worker at once, to amortize the pickling overhead
+        :param max_pending_chunks: The maximum number of chunks submitted but not yet consumed.
+        Defaults to twice the number of workers, which bounds the number of pages held in memory.
+        """
+        self._from_language = from_language
+        self._to_language = to_language
+        self._workers = workers or os.cpu_count() or 1
+        self._chunk_size = chunk_size
+        self._max_pending_chunks = max_pending_chunks or self._workers * 2
+        self._executor = ProcessPoolExecutor(max_workers=self._workers)
+
+    def map(self, pages: Iterable[Page]) -> Iterator[Dict[str, Any]]:
+        """
+        Scrape the given (word, html) pairs, yielding the responses in input order.
+        """
+        pages = iter(pages)
+        pending: Deque[Future] = deque()
+        while True:
+            while len(pending) < self._max_pending_chunks:
+                chunk = list(islice(pages, self._chunk_size))
+                if not chunk:
+                    break
+                pending.append(self._executor.submit(
+                    _scrape_chunk, self._from_language, self._to_language, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    def __enter__(self) -> 'ParserPool':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def parse_many(from_language: str,
+               to_language: str,
+               pages: Iterable[Page],
+               workers: Optional[int] = None,
+               chunk_size: int = 16) -> Iterator[Dict[str, Any]]:
+    """
+    Scrape the given (word, html) pairs on all CPUs, yielding the responses in input order.
+    """
+    with ParserPool(from_language, to_language, workers=workers, chunk_size=chunk_size) as pool:
+        yield from pool.map(pages)
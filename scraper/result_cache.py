@@ -0,0 +1,98 @@
+import copy
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def approximate_size(value: Any) -> int:
+    """
+    The approximate memory size of a response in bytes, including everything it contains.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += approximate_size(key) + approximate_size(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            size += approximate_size(item)
+    return size
+
+
+class ResultCache:
+    """
+    A thread-safe in-memory LRU cache of scrape responses.
+    Concurrent lookups of the same key while it is being computed wait for that single computation.
+    Responses are copied on the way out, so callers are free to modify them.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = None):
+        """
+        :param max_entries: The maximum number of cached responses
+        :param max_bytes: The maximum approximate total size of the cached responses. Unlimited if not given.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Tuple[Dict[str, Any], int]] = OrderedDict()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                flight = self._in_flight.get(key)
+                leader = flight is None
+                if leader:
+                    self.misses += 1
+                    flight = Future()
+                    self._in_flight[key] = flight
+                else:
+                    self.hits += 1
+
+        if entry is not None:
+            return copy.deepcopy(entry[0])
+        if not leader:
+            return copy.deepcopy(flight.result())
+
+        try:
+            result = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            flight.set_exception(e)
+            raise
+        with self._lock:
+            del self._in_flight[key]
+            self._store(key, result)
+        flight.set_result(result)
+        return copy.deepcopy(result)
+
+    def _store(self, key: Hashable, result: Dict[str, Any]) -> None:
+        size = approximate_size(result)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._entries[key] = (result, size)
+        self._size += size
+        while len(self._entries) > self.max_entries or self.max_bytes is not None and self._size > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
@@ -1,66 +1,377 @@
-import re
-from typing import Dict, Any, List
-import requests
+import json
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
+from importlib.util import find_spec
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Set, Tuple, Union
+from urllib.parse import urlencode
 from bs4 import BeautifulSoup, PageElement, ResultSet, Tag, NavigableString
-from scraper.language import get_language, language_names
-
-
-def scrape(from_language: str, to_language: str, word: str) -> Dict[str, Any]:
-    return Scraper(from_language, to_language).scrape(word)
-
-
-def get_html(url: str) -> str:
-    response = requests.get(url)
-    code = response.status_code
-    if code != 200:
-        raise FileNotFoundError(f'URL not found with status code {code}: {url}')
-    return response.content.decode('utf-8')
-
-
-def get_root_element(url: str) -> BeautifulSoup:
-    html = get_html(url)
-    return BeautifulSoup(html, 'html.parser')
-
-
-def get_pronunciation(header: PageElement) -> List[Dict[str, Any]]:
+from scraper.instrumentation import DISABLED, Instrumentation
+from scraper.language import HeaderClassifier, get_language, language_names
+from scraper.model import (MEANING_LIST_FIELDS, Definition, Example, Meaning, Pronunciation, PronunciationValue,
+                           WordResult)
+from scraper.result_cache import ResultCache
+from scraper.transport import FetchError, PageNotFoundError, Transport, TransientError, Timeout, get_default_transport
+
+
+def scrape(from_language: str,
+           to_language: str,
+           word: str,
+           result_cache: Optional[ResultCache] = None,
+           fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    if fields is not None:
+        fields = frozenset(fields)
+    if result_cache is None:
+        return get_scraper(from_language, to_language, fields=fields).scrape(word)
+    return result_cache.get_or_compute(
+        (from_language, to_language, word, fields),
+        lambda: get_scraper(from_language, to_language, fields=fields).scrape(word))
+
+
+@lru_cache(maxsize=None)
+def get_scraper(from_language: str,
+                to_language: str,
+                parser: Optional[str] = None,
+                fields: Optional[frozenset] = None) -> 'Scraper':
+    """
+    A shared Scraper with the default transport for the given language pair.
+    """
+    return Scraper(from_language, to_language, parser=parser, fields=fields)
+
+
+def scrape_many(from_language: str,
+                to_language: str,
+                words: Iterable[str],
+                transport: Optional[Transport] = None,
+                pool_size: int = 10,
+                timeout: Optional[Timeout] = (5.0, 30.0),
+                base_url: Optional[str] = None,
+                instrumentation: Optional[Instrumentation] = None,
+                return_errors: bool = False,
+                preflight: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Scrape the given words one after another, reusing keep-alive connections to the wiki host.
+    If no transport is given, one is created with the given pool size, timeout and instrumentation
+    and closed when done.
+    If return_errors is set, a word which could not be fetched yields an error response instead of ending the batch,
+    see error_response.
+    If preflight is set, the words are first resolved in batches with the query API, see Scraper.resolve_titles.
+    Words without a page are skipped without being fetched, or yield a not_found error response if return_errors
+    is set. Words which redirect to a page are scraped from that page, and their responses name the word in
+    redirected_from. Such a page is fetched once for all the words which lead to it, see mark_redirect_targets.
+    Its response is kept for the REDIRECT_PAGES_SIZE most recently used titles only, so the memory used does not
+    grow with the number of words. The responses of these words are shallow copies of each other.
+    """
+    owns_transport = transport is None
+    if owns_transport:
+        transport = Transport(pool_size=pool_size, timeout=timeout, instrumentation=instrumentation)
+    try:
+        word_scraper = Scraper(from_language, to_language, transport=transport, base_url=base_url,
+                               instrumentation=instrumentation)
+        if preflight:
+            titles = mark_redirect_targets(word_scraper.resolve_titles(words))
+        else:
+            titles = ((word, word, False) for word in words)
+        # Responses of the pages which words redirect to, by title, least recently used first
+        pages: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        for word, title, is_target in titles:
+            if title is None:
+                if return_errors:
+                    error = PageNotFoundError(f'No page for {word}', word_scraper._get_url(word))
+                    yield error_response(from_language, to_language, word, error)
+                continue
+            try:
+                if not is_target:
+                    response = word_scraper.scrape(title)
+                else:
+                    page = pages.get(title)
+                    if page is None:
+                        page = pages[title] = word_scraper.scrape(title)
+                        if len(pages) > REDIRECT_PAGES_SIZE:
+                            pages.popitem(last=False)
+                    else:
+                        pages.move_to_end(title)
+                    response = dict(page)
+            except FileNotFoundError as e:
+                if not return_errors:
+                    raise
+                response = error_response(from_language, to_language, word, e)
+            if title != word:
+                response['redirected_from'] = word
+            yield response
+    finally:
+        if owns_transport:
+            transport.close()
+
+
+def error_response(from_language: str, to_language: str, word: str, error: Exception) -> Dict[str, Any]:
+    """
+    A response for a word whose page could not be fetched. Its error is not_found if the wiki has no page
+    for the word, transient if the request failed and may succeed when retried later, or failed otherwise.
+    """
+    if isinstance(error, PageNotFoundError):
+        kind = 'not_found'
+    elif isinstance(error, TransientError):
+        kind = 'transient'
+    else:
+        kind = 'failed'
+    return {
+        'word': word,
+        'from_language': from_language,
+        'to_language': to_language,
+        'meanings': [],
+        'error': kind,
+        'message': str(error),
+    }
+
+
+def get_html(url: str, transport: Optional[Transport] = None, language_name: Optional[str] = None) -> str:
+    """
+    Fetch a page. If a language name is given, only the section of that language is kept while the page is
+    streamed in, or an empty string if the page has no such section.
+    Pages are kept whole when the transport caches them.
+    """
+    if transport is None:
+        transport = get_default_transport()
+    if language_name is None or transport.cache is not None:
+        return transport.get_html(url)
+    slicer = SectionSlicer(language_name)
+    # The rest of the page is still read once the section is complete, so that the connection can be reused
+    for chunk in transport.iter_html(url):
+        slicer.feed(chunk)
+    section = slicer.close()
+    return '' if section is None else section
+
+
+# BeautifulSoup tree builders which produce identical results on Wiktionary pages, fastest first
+PARSERS = ['lxml', 'html.parser']
+
+
+def scrape_html(from_language: str,
+                to_language: str,
+                word: str,
+                html: str,
+                parser: Optional[str] = None) -> Dict[str, Any]:
+    return get_scraper(from_language, to_language, parser).scrape_html(word, html)
+
+
+def get_root_element(url: str, transport: Optional[Transport] = None, parser: Optional[str] = None) -> BeautifulSoup:
+    html = get_html(url, transport)
+    return parse_html(html, parser)
+
+
+def get_default_parser() -> str:
+    for parser in PARSERS:
+        # html.parser is part of the standard library, the others are optional dependencies
+        if parser == 'html.parser' or find_spec(parser) is not None:
+            return parser
+    return 'html.parser'
+
+
+# The fields which can be selected for extraction
+FIELDS = frozenset(['etymology', 'part_of_speech', 'metadata', 'definitions', 'examples', 'pronunciation']
+                   + MEANING_LIST_FIELDS)
+
+# How pages are fetched: the whole rendered article, or only the language section from the MediaWiki parse API
+FETCH_MODES = ['page', 'parse']
+
+
+def get_api_json(url: str, transport: Optional[Transport] = None) -> Dict[str, Any]:
+    data = json.loads(get_html(url, transport))
+    error = data.get('error')
+    if error is not None:
+        if error.get('code') in ['missingtitle', 'invalidtitle']:
+            raise PageNotFoundError(f'Page not found ({error.get("code")}): {url}', url)
+        raise FetchError(f'API error {error.get("code")}: {error.get("info")}: {url}', url)
+    return data
+
+
+# The maximum number of titles the query API resolves in one request
+QUERY_BATCH_SIZE = 50
+# The number of pages of redirect targets kept while scraping many words. Two words marked by mark_redirect_targets
+# for the same title are less than three batches apart, so the page is always still kept for the second one.
+REDIRECT_PAGES_SIZE = 3 * QUERY_BATCH_SIZE
+
+
+def mark_redirect_targets(titles: Iterable[Tuple[str, Optional[str]]]) -> Iterator[Tuple[str, Optional[str], bool]]:
+    """
+    Add to every (word, title) pair of Scraper.resolve_titles whether other words redirect to the title,
+    looking ahead one batch of QUERY_BATCH_SIZE words, so that the page of such a title can be fetched once for
+    all of them. A word whose page is fetched before a word of a later batch redirects to it is not marked.
+    Only the redirects of the current and the previous batch are remembered, so a title which words redirect to
+    again after a batch without such redirects is fetched again.
+    """
+    titles = iter(titles)
+    previous: Set[str] = set()
+    while True:
+        batch = list(islice(titles, QUERY_BATCH_SIZE))
+        if not batch:
+            return
+        current = {title for word, title in batch if title is not None and title != word}
+        targets = previous | current
+        for word, title in batch:
+            yield word, title, title in targets
+        previous = current
+
+
+def resolve_titles(titles: Iterable[str],
+                   base_url: str,
+                   transport: Optional[Transport] = None) -> Dict[str, Optional[str]]:
+    """
+    Resolve up to QUERY_BATCH_SIZE titles with a single request to the query API of a wiki.
+    Maps every title to the title of the page it names after normalization and redirects,
+    or to None if there is no such page.
+    """
+    titles = list(titles)
+    url = f'{base_url}/w/api.php?' + urlencode({
+        'action': 'query',
+        'titles': '|'.join(titles),
+        'redirects': '1',
+        'format': 'json',
+        'formatversion': '2',
+    })
+    query = get_api_json(url, transport).get('query', {})
+    normalized = {entry['from']: entry['to'] for entry in query.get('normalized', [])}
+    redirects = {entry['from']: entry['to'] for entry in query.get('redirects', [])}
+    existing = {page['title'] for page in query.get('pages', [])
+                if not page.get('missing') and not page.get('invalid')}
+    resolved = {}
+    for title in titles:
+        target = normalized.get(title, title)
+        seen = {target}
+        while target in redirects and redirects[target] not in seen:
+            target = redirects[target]
+            seen.add(target)
+        resolved[title] = target if target in existing else None
+    return resolved
+
+
+def parse_html(html: str, parser: Optional[str] = None) -> BeautifulSoup:
+    if parser is None:
+        parser = get_default_parser()
+    elif parser not in PARSERS:
+        raise ValueError(f'Unsupported parser {parser}, expected one of {", ".join(PARSERS)}')
+    return BeautifulSoup(html, parser)
+
+
+def slice_language_section(html: str, language_name: str) -> Optional[str]:
+    """
+    Cut the section of the given language out of the raw HTML of a page, so that only that section needs to be parsed.
+    The section starts at its h2 header and ends before the next h2 header or at the end of the page content.
+    Returns None if the section header is not found.
+    """
+    label = f'id="{language_name}"'
+    position = html.find(label)
+    while position != -1:
+        start = html.rfind('<h2', 0, position)
+        if start != -1 and html.find('</h2>', start, position) == -1:
+            end = html.find('<h2', position)
+            content_end = html.find('NewPP limit report', position)
+            if content_end != -1:
+                content_end = html.rfind('<!--', position, content_end)
+            if end == -1 or content_end != -1 and content_end < end:
+                end = content_end
+            return html[start:] if end == -1 else html[start:end]
+        position = html.find(label, position + len(label))
+    return None
+
+
+class SectionSlicer:
+    """
+    Cuts the section of a language out of a page fed in chunks, like slice_language_section, without keeping
+    more of the page in memory than the section and the last few characters before it.
+    """
+
+    def __init__(self, language_name: str):
+        self._language_name = language_name
+        self._label = f'id="{language_name}"'
+        self._buffer = ''
+        self._parts: Optional[List[str]] = None
+        self._tail = ''
+        self.done = False
+
+    def feed(self, text: str) -> bool:
+        """
+        Add the next chunk of the page. Returns True once the section is complete and no more chunks are needed.
+        """
+        if self.done:
+            return True
+        if self._parts is None:
+            self._buffer += text
+            start = self._find_start()
+            if start is None:
+                self._trim_buffer()
+                return False
+            text = self._buffer[start:]
+            self._buffer = ''
+            self._parts = [text]
+            # The header of the section itself is not the end of the section
+            self.done = text.find('<h2', 1) != -1
+        else:
+            self._parts.append(text)
+            self.done = (self._tail + text).find('<h2') != -1
+        self._tail = (self._tail + text)[-2:]
+        return self.done
+
+    def close(self) -> Optional[str]:
+        """
+        The section, or None if the page has no section of the language.
+        """
+        if self._parts is None:
+            return None
+        return slice_language_section(''.join(self._parts), self._language_name)
+
+    def _find_start(self) -> Optional[int]:
+        buffer = self._buffer
+        position = buffer.find(self._label)
+        while position != -1:
+            start = buffer.rfind('<h2', 0, position)
+            if start != -1 and buffer.find('</h2>', start, position) == -1:
+                return start
+            position = buffer.find(self._label, position + len(self._label))
+        return None
+
+    def _trim_buffer(self) -> None:
+        # Keep an h2 header which is still open, or enough characters to find a label split between chunks
+        keep = len(self._buffer) - len(self._label)
+        header = self._buffer.rfind('<h2')
+        if header != -1 and self._buffer.find('</h2>', header) == -1:
+            keep = min(keep, header)
+        if keep > 0:
+            self._buffer = self._buffer[keep:]
+
+
+def get_pronunciation(header: PageElement, skipped: Set[int]) -> List[Pronunciation]:
     results = []
     ul: Tag = header.find_next_sibling()
     if ul.name == 'ul' or ul.name == 'dl':
         get_ipa(ul, results)
         get_pronunciation_type(ul, results, 'Hyphenation', 'Latn')
-        process_audio(ul, results)
+        process_audio(ul, results, skipped)
     return results
 
 
-def process_audio(list_container: PageElement, results: List[Dict[str, Any]]):
-    audio_tables: ResultSet[PageElement] = list_container.find_all('table', class_='audiotable')
+def process_audio(list_container: PageElement, results: List[Pronunciation], skipped: Set[int]):
+    audio_tables = find_all_kept(list_container, skipped, 'table', class_='audiotable')
     for audio_table in audio_tables:
         trs: ResultSet[PageElement] = audio_table.find_all('tr')
         for tr in trs:
             td_type: PageElement = tr.find_next('td', class_='audiolink')
             td_file: PageElement = tr.find_next('td', class_='audiofile')
             if td_type and td_file:
-                results.append({
-                    'type': td_type.text,
-                    'values': [{
-                        'type': src.attrs['type'],
-                        'value': src.attrs['src']
-                    } for src in td_file.find_all('source')]
-                })
-        audio_table.extract()
-
-    audio_divs: List[PageElement] = list_container.find_all('div', class_='mediaContainer')
+                results.append(Pronunciation(td_type.text, [
+                    PronunciationValue(src.attrs['type'], src.attrs['src']) for src in td_file.find_all('source')
+                ]))
+        skipped.add(id(audio_table))
+
+    audio_divs = find_all_kept(list_container, skipped, 'div', class_='mediaContainer')
     for audio_div in audio_divs:
-        results.append({
-            'type': 'Audio',
-            'values': [{
-                'type': src.attrs['type'].text,
-                'value': src.attrs['src'].text
-            } for src in audio_div.find_all('source')]
-        })
+        results.append(Pronunciation('Audio', [
+            PronunciationValue(src.attrs['type'].text, src.attrs['src'].text) for src in audio_div.find_all('source')
+        ]))
 
 
-def get_ipa(ul: PageElement, results: List[Dict[str, any]]):
+def get_ipa(ul: PageElement, results: List[Pronunciation]):
     value_spans: ResultSet[Tag] = ul.find_all('span', class_='IPA')
     if value_spans:
         values = []
@@ -69,304 +380,469 @@ def get_ipa(ul: PageElement, results: List[Dict[str, any]]):
             type_text = 'IPA'
             if type_span:
                 type_text = type_span.text
-            values.append({'type': type_text, 'value': value_span.text})
+            values.append(PronunciationValue(type_text, value_span.text))
 
-        results.append({
-            'type': 'IPA',
-            'values': values
-        })
+        results.append(Pronunciation('IPA', values))
     else:
         a = ul.find_next('a', title='IPA')
         if a:
             a_text: str = a.parent.getText()
             if a_text and ':' in a_text:
-                results.append({
-                    'type': 'IPA',
-                    'values': [{'type': 'IPA', 'value': a_text.split(':')[1].strip()}]
-                })
+                results.append(Pronunciation('IPA', [PronunciationValue('IPA', a_text.split(':')[1].strip())]))
 
 
 def get_pronunciation_type(ul: PageElement,
-                           results: List[Dict[str, Any]],
+                           results: List[Pronunciation],
                            pronunciation_type: str,
                            css_class: str):
     values = ul.find_all('span', class_=css_class)
     if values:
-        results.append({
-            'type': pronunciation_type,
-            'values': [{'type': pronunciation_type, 'value': span.text} for span in values]
-        })
+        results.append(Pronunciation(pronunciation_type, [
+            PronunciationValue(pronunciation_type, span.text) for span in values
+        ]))
     else:
         a = ul.find_next('a', title=pronunciation_type)
         if a:
             a_text: str = a.parent.getText()
             if a_text and ':' in a_text:
-                results.append({
-                    'type': pronunciation_type,
-                    'values': [{'type': pronunciation_type, 'value': a_text.split(':')[1].strip()}]
-                })
+                results.append(Pronunciation(pronunciation_type, [
+                    PronunciationValue(pronunciation_type, a_text.split(':')[1].strip())
+                ]))
+
+
+def is_skipped(element: PageElement, skipped: Set[int], container: PageElement) -> bool:
+    """
+    Whether the element or one of its ancestors below the container is skipped.
+    """
+    while element is not None and element is not container:
+        if id(element) in skipped:
+            return True
+        element = element.parent
+    return False
+
+
+def find_all_kept(container: Tag, skipped: Set[int], *args, **kwargs) -> List[Tag]:
+    """
+    container.find_all() leaving out the elements which are skipped or within skipped elements.
+    """
+    elements = container.find_all(*args, **kwargs)
+    if not skipped:
+        return elements
+    return [element for element in elements if not is_skipped(element, skipped, container)]
+
 
+def find_kept(container: Tag, skipped: Set[int], *args, **kwargs) -> Optional[Tag]:
+    elements = find_all_kept(container, skipped, *args, **kwargs)
+    return elements[0] if elements else None
 
-def remove_descendants_with_class(parent: PageElement, class_to_remove: str):
-    hq_toggles: ResultSet[PageElement] = parent.find_all(class_=class_to_remove)
-    for hq_toggle in hq_toggles:
-        hq_toggle.extract()
 
+def get_kept_text(element: Tag, skipped: Set[int]) -> str:
+    """
+    element.get_text() leaving out the text within skipped elements.
+    """
+    if not skipped:
+        return element.get_text()
+    types = element.interesting_string_types or Tag.MAIN_CONTENT_STRING_TYPES
+    return ''.join(_kept_strings(element, skipped, types))
 
-def remove_parent_of_descendant_with_class(parent: PageElement, class_to_remove: str):
-    hq_toggles = parent.find_all(class_=class_to_remove)
-    for hq_toggle in hq_toggles:
-        if hq_toggle and hq_toggle.parent:
-            hq_toggle.parent.extract()
 
+def _kept_strings(element: Tag, skipped: Set[int], types) -> Iterator[str]:
+    for child in element.children:
+        if isinstance(child, NavigableString):
+            if type(child) is types if isinstance(types, type) else type(child) in types:
+                yield child
+        elif id(child) not in skipped:
+            yield from _kept_strings(child, skipped, types)
 
-def find_usage_examples(parent: PageElement) -> List[Dict[str, Any]]:
-    dl: Tag = parent.find('dl')
+
+def skip_descendants_with_class(parent: Tag, class_to_skip: str, skipped: Set[int]):
+    for element in find_all_kept(parent, skipped, class_=class_to_skip):
+        skipped.add(id(element))
+
+
+def skip_parent_of_descendant_with_class(parent: Tag, class_to_skip: str, skipped: Set[int]):
+    for element in find_all_kept(parent, skipped, class_=class_to_skip):
+        if element.parent:
+            skipped.add(id(element.parent))
+
+
+def find_usage_examples(parent: Tag, skipped: Set[int]) -> List[Example]:
+    dl = find_kept(parent, skipped, 'dl')
     examples = []
     if dl:
-        example_divs: List[Tag] = dl.find_all(class_='h-usage-example')
+        example_divs = find_all_kept(dl, skipped, class_='h-usage-example')
         for example_div in example_divs:
-            example_span: Tag = example_div.find(class_='e-example')
+            example_span = find_kept(example_div, skipped, class_='e-example')
             if example_span:
-                example = {
-                    'example': example_span.get_text(),
-                    'translation': None,
-                }
-                translation: Tag = example_div.find(class_='e-translation')
+                example = Example(get_kept_text(example_span, skipped))
+                translation = find_kept(example_div, skipped, class_='e-translation')
                 if translation:
-                    example['translation'] = translation.get_text()
+                    example.translation = get_kept_text(translation, skipped)
                 examples.append(example)
-            example_div.extract()
+            skipped.add(id(example_div))
 
-        example_dds: ResultSet[Tag] = dl.find_all('dd', recursive=False)
+        example_dds = find_all_kept(dl, skipped, 'dd', recursive=False)
         for example_dd in example_dds:
-            if example_dd.get_text():
-                example = {
-                    'example': None,
-                    'translation': None,
-                }
-                translation_dd: Tag = example_dd.find('dd')
-                if translation_dd and translation_dd.get_text():
-                    example['translation'] = translation_dd.get_text().strip()
-                    translation_dd.extract()
-                example['example'] = example_dd.get_text().strip()
+            if get_kept_text(example_dd, skipped):
+                example = Example()
+                translation_dd = find_kept(example_dd, skipped, 'dd')
+                if translation_dd and get_kept_text(translation_dd, skipped):
+                    example.translation = get_kept_text(translation_dd, skipped).strip()
+                    skipped.add(id(translation_dd))
+                example.example = get_kept_text(example_dd, skipped).strip()
                 examples.append(example)
-        dl.extract()
+        skipped.add(id(dl))
     return examples
 
 
-def is_part_of_speech_header(header: PageElement) -> bool:
-    next_sibling: Tag = header.find_next_sibling()
-    while next_sibling and next_sibling.name in ['table', 'p', 'div', 'pre', 'figure']:
-        next_sibling = next_sibling.find_next_sibling()
-    if next_sibling and next_sibling.name in ['ol', 'dl']:
-        return True
-    return False
-
-
-def process_by_id(after_meaning_values: PageElement,
-                  meaning: Dict[str, Any],
-                  response_field: str,
-                  tag_id: str):
-    result = []
-    if after_meaning_values.name in ['h3', 'h4', 'h5']:
-        h4: PageElement = after_meaning_values
-        span: Tag = after_meaning_values.find(id=lambda x: x and x.startswith(tag_id))
-        if span:
-            ul: Tag = h4.find_next_sibling()
-            if ul.name == 'ul':
-                lis = ul.find_all('li')
-                for li in lis:
-                    result.append(li.get_text())
-    if result:
-        meaning[response_field] = result
+class SectionIndex:
+    """
+    The top-level elements of a language section, from its h2 header to the header of the next language or the end
+    of the page content, with the kind of every element worked out once so that the extraction never has to scan
+    ahead again.
+    The extraction leaves the parsed page untouched. Elements it has consumed are recorded in skipped instead of being
+    removed, so that later steps leave them out.
+    """
+
+    def __init__(self, header: Tag, classifier: HeaderClassifier):
+        self.nodes: List[Tag] = [header]
+        for sibling in header.next_siblings:
+            if isinstance(sibling, Tag):
+                # The section ends at the header of the next language when the whole page was parsed
+                if sibling.name == 'h2':
+                    break
+                self.nodes.append(sibling)
+        count = len(self.nodes)
+        # Identities of the elements which are left out of the extraction, with everything within them
+        self.skipped: Set[int] = set()
+        classes = [classifier.classify(node) for node in self.nodes]
+        self.is_pronunciation = [header_class.is_pronunciation for header_class in classes]
+        self.is_etymology = [header_class.is_etymology for header_class in classes]
+        # Names of the response fields an h3, h4 or h5 header introduces a list of terms for
+        self.additional_data: List[Tuple[str, ...]] = [header_class.additional_data for header_class in classes]
+        # Position of the next ol or dl at or after each position, and whether each element is followed by
+        # one with only tables, paragraphs and the like in between, which is what makes it a part of speech header
+        self.next_list: List[Optional[int]] = [None] * count
+        self.is_part_of_speech = [False] * count
+        next_list = None
+        next_content = None
+        for position in range(count - 1, -1, -1):
+            name = self.nodes[position].name
+            self.is_part_of_speech[position] = (next_content is not None
+                                                and self.nodes[next_content].name in ['ol', 'dl'])
+            if name in ['ol', 'dl']:
+                next_list = position
+            self.next_list[position] = next_list
+            if name not in ['table', 'p', 'div', 'pre', 'figure']:
+                next_content = position
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def is_meaning_switcher(self, position: int) -> bool:
+        return self.is_pronunciation[position] or self.is_etymology[position] or self.is_part_of_speech[position]
+
+    def get(self, position: int) -> Optional[Tag]:
+        return self.nodes[position] if position < len(self.nodes) else None
 
 
 class Scraper:
-
-    def __init__(self, from_language: str = 'en', to_language: str = 'en'):
+    """
+    Scrapes word data from Wiktionary for a language pair.
+    A Scraper keeps no state between words, so a single instance can scrape any number of words from many threads.
+    """
+
+    def __init__(self,
+                 from_language: str = 'en',
+                 to_language: str = 'en',
+                 transport: Optional[Transport] = None,
+                 base_url: Optional[str] = None,
+                 parser: Optional[str] = None,
+                 instrumentation: Optional[Instrumentation] = None,
+                 fetch_mode: str = 'page',
+                 typed: bool = False,
+                 fields: Optional[Iterable[str]] = None):
         """
         :param from_language: The 2-character representation of the input language (en, tr etc.)
         :param to_language: The 2-character representation of the language we are translating to (en, tr etc.)
         If we are looking up en to en, this will be "English".
         If we are looking up en to tr, this will be "İngilizce".
+        :param transport: The HTTP transport used to fetch pages. The shared default transport is used if not given.
+        :param base_url: The wiki to fetch pages from. Defaults to https://<to_language>.wiktionary.org
+        :param parser: The BeautifulSoup parser, one of PARSERS. Defaults to the fastest one installed.
+        :param instrumentation: Receives the timings and counters of the parse and extraction stages.
+        Pass the same instrumentation to the transport to get the fetch stages too.
+        :param fetch_mode: One of FETCH_MODES. page fetches the rendered article page, parse fetches only the HTML of
+        the language section from the MediaWiki parse API, which takes two small requests instead of a large one.
+        :param typed: Return WordResult records, which take considerably less memory than the response dicts
+        and convert to them with to_dict()
+        :param fields: The fields to extract, out of FIELDS. Extracting only the needed fields skips the work
+        of the others. Fields which are not extracted are left out, except for definitions and examples,
+        which are left empty. All fields are extracted if not given.
         """
+        if fetch_mode not in FETCH_MODES:
+            raise ValueError(f'Unsupported fetch mode {fetch_mode}, expected one of {", ".join(FETCH_MODES)}')
         self._from_language_name = language_names[to_language][from_language]
         self._from_language = get_language(alpha2=from_language)
         self._to_language = get_language(alpha2=to_language)
+        self._transport = transport
+        self._base_url = base_url or f'https://{self._to_language.alpha2}.wiktionary.org'
+        self._parser = parser or get_default_parser()
+        self._header_classifier = self._to_language.header_classifier
+        self._instrumentation = instrumentation or DISABLED
+        self._fetch_mode = fetch_mode
+        self._typed = typed
+        self._fields = FIELDS if fields is None else frozenset(fields)
+        if not self._fields <= FIELDS:
+            raise ValueError(f'Unsupported fields {", ".join(sorted(self._fields - FIELDS))}, '
+                             f'expected some of {", ".join(sorted(FIELDS))}')
+        self._list_fields = [name for name in MEANING_LIST_FIELDS if name in self._fields]
+
+    def scrape(self, word: str) -> Union[Dict[str, Any], WordResult]:
+        return self.scrape_html(word, self.fetch_html(word))
+
+    def resolve_titles(self, words: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Yield every word with the title of the page it names after normalization and redirects, or None if the wiki
+        has no page for it. The words are resolved QUERY_BATCH_SIZE at a time, each batch with one request.
+        """
+        words = iter(words)
+        while True:
+            batch = list(islice(words, QUERY_BATCH_SIZE))
+            if not batch:
+                return
+            # Titles with characters which are not allowed in titles can not be resolved
+            valid = [word for word in batch if word and not any(character in word for character in '|#<>[]{}')]
+            resolved = resolve_titles(dict.fromkeys(valid), self._base_url, self._transport) if valid else {}
+            for word in batch:
+                yield word, resolved.get(word)
+
+    def fetch_html(self, word: str) -> str:
+        """
+        Fetch the section of the source language of the page of the word.
+        """
+        if self._fetch_mode == 'parse':
+            return self._fetch_section_html(word)
+        return get_html(self._get_url(word), self._transport, self._from_language_name)
+
+    def fetch_page(self, word: str) -> str:
+        """
+        Fetch the whole page of the word, with the sections of every language.
+        """
+        return get_html(self._get_url(word), self._transport)
+
+    def _fetch_section_html(self, word: str) -> str:
+        """
+        Look up the number of the source language section of the page, then fetch only the content HTML of that
+        section. Returns an empty string if the page has no such section.
+        """
+        params = {'action': 'parse', 'page': word, 'format': 'json', 'formatversion': '2', 'redirects': '1'}
+        sections = get_api_json(self._get_api_url({**params, 'prop': 'sections'}), self._transport)
+        for section in sections['parse']['sections']:
+            if section['level'] == '2' and self._from_language_name in [section['anchor'], section['line']]:
+                break
+        else:
+            return ''
+        text = get_api_json(self._get_api_url({
+            **params,
+            'prop': 'text',
+            'section': section['index'],
+            'disableeditsection': '1',
+            'disablelimitreport': '1',
+            'disabletoc': '1',
+        }), self._transport)
+        return text['parse']['text']
+
+    def scrape_html(self, word: str, html: str) -> Union[Dict[str, Any], WordResult]:
+        return self.scrape_root(word, self.parse(html))
+
+    def parse(self, html: str) -> BeautifulSoup:
+        """
+        Parse the section of the source language out of a page.
+        """
+        instrumentation = self._instrumentation
+        with instrumentation.timed('prune'):
+            section = slice_language_section(html, self._from_language_name)
+        with instrumentation.timed('parse'):
+            root = parse_html(html if section is None else section, self._parser)
+        if instrumentation.enabled:
+            instrumentation.count('nodes_parsed', len(root.find_all()))
+        return root
+
+    def scrape_root(self, word: str, root: BeautifulSoup) -> Union[Dict[str, Any], WordResult]:
+        """
+        Extract the word data from a page parsed with parse(), as a WordResult if the scraper is typed.
+        """
+        result = self.extract(word, root)
+        return result if self._typed else result.to_dict()
 
-        # Key is the name of field in response. Value is the HTML element ID on the Wiktionary page
-        self._additional_data = {
-            'see_also': 'See_also',
-            'related_terms': 'Related_terms',
-            'synonyms': 'Synonyms',
-            'antonyms': 'Antonyms',
-            'proverbs': self._to_language.proverbs,
-            'derived_terms': self._to_language.derived_terms,
-        }
-
-        self.response = {
-            'word': '',
-            'from_language': from_language,
-            'to_language': to_language,
-            'meanings': []
-        }
-
-    def scrape(self, word: str) -> Dict[str, Any]:
-        root = get_root_element(self._get_url(word))
-        self._remove_other_languages(root)
+    def extract(self, word: str, root: BeautifulSoup) -> WordResult:
+        """
+        Extract the word data from a page parsed with parse(), or from any parsed page with a section of the
+        source language. The parsed page is only read, so it can be extracted from any number of times,
+        from several threads at once.
+        """
         label = root.find(id=self._from_language_name)
-        self.response['word'] = word
+        response = WordResult(word, self._from_language.alpha2, self._to_language.alpha2)
+        instrumentation = self._instrumentation
+        index = None
         if label is not None:
-            siblings: ResultSet[PageElement] = label.parent.find_next_siblings(['h2', 'h3', 'hr'])
-            processed_headers = []
-            for sibling in siblings:
-                if sibling.name in ['hr', 'h2']:
-                    break
-                else:
-                    sibling_text = str(sibling)
-                    if sibling_text not in processed_headers:
-                        self._process_header(sibling, processed_headers)
-                    processed_headers.append(sibling_text)
-        if not self._response_has_audio():
-            self._process_pronunciation(root)
-        return self.response
-
-    def _response_has_audio(self) -> bool:
-        if 'pronunciation' not in self.response:
+            with instrumentation.timed('section_walk'):
+                index = SectionIndex(label.parent, self._header_classifier)
+                # Positions of headers already consumed while processing an earlier header
+                processed_headers: Set[int] = set()
+                for position in range(1, len(index)):
+                    name = index.nodes[position].name
+                    if name in ['hr', 'h2']:
+                        break
+                    elif name == 'h3' and position not in processed_headers:
+                        processed_headers.add(position)
+                        with instrumentation.timed('process_header'):
+                            self._process_header(index, position, response, processed_headers)
+        if 'pronunciation' in self._fields and not self._response_has_audio(response):
+            with instrumentation.timed('process_pronunciation'):
+                self._process_pronunciation(index, response)
+        if instrumentation.enabled:
+            instrumentation.count('definitions_found', sum(len(meaning.definitions) for meaning in response.meanings))
+        return response
+
+    def _response_has_audio(self, response: WordResult) -> bool:
+        if response.pronunciation is None:
             return False
-        for pronunciation in self.response['pronunciation']:
-            for pronunciation_value in pronunciation['values']:
-                if 'value' in pronunciation_value and (
-                        '.mp3' in pronunciation_value['value']
-                        or '.ogg' in pronunciation_value['value']):
+        for pronunciation in response.pronunciation:
+            for pronunciation_value in pronunciation.values:
+                if '.mp3' in pronunciation_value.value or '.ogg' in pronunciation_value.value:
                     return True
         return False
 
-    def _remove_other_languages(self, root: PageElement):
-        languages: ResultSet[Tag] = root.find_all(name='h2')
-        for language in languages:
-            language_container: Tag = language.find(id=self._from_language_name)
-            if language_container is None:
-                # Remove until next language h2
-                siblings = language.find_next_siblings()
-                language.extract()
-                for sibling in siblings:
-                    if sibling.name == 'h2':
-                        break
-                    sibling.extract()
-
     def _get_url(self, word: str) -> str:
-        return f'https://{self._to_language.alpha2}.wiktionary.org/wiki/{word}'
-
-    def _process_header(self, header: PageElement, processed_headers):
-        if self._is_pronunciation_header(header):
-            self.response['pronunciation'] = get_pronunciation(header)
-        elif self._is_etymology_header(header):
-            self.response['meanings'].append(self._get_meaning_with_etymology(header, processed_headers))
-        elif is_part_of_speech_header(header):
-            self.response['meanings'].append(self._get_meaning_without_etymology(header))
-
-    def _is_pronunciation_header(self, header: PageElement) -> bool:
-        if header.find_all('span', string=self._to_language.pronunciation):
-            return True
-        return False
-
-    def _get_meaning_without_etymology(self, header: PageElement) -> [Dict[str, Any]]:
-        result = {'etymology': None, 'definitions': []}
-        spans: ResultSet[Tag] = header.find_all('span')
+        return f'{self._base_url}/wiki/{word}'
+
+    def _get_api_url(self, params: Dict[str, str]) -> str:
+        return f'{self._base_url}/w/api.php?{urlencode(params)}'
+
+    def _process_header(self,
+                        index: SectionIndex,
+                        position: int,
+                        response: WordResult,
+                        processed_headers: Set[int]):
+        if index.is_pronunciation[position]:
+            if 'pronunciation' in self._fields:
+                response.pronunciation = get_pronunciation(index.nodes[position], index.skipped)
+        elif index.is_etymology[position]:
+            response.meanings.append(self._get_meaning_with_etymology(index, position, processed_headers))
+        elif index.is_part_of_speech[position]:
+            response.meanings.append(self._get_meaning_without_etymology(index, position))
+
+    def _get_meaning_without_etymology(self, index: SectionIndex, position: int) -> Meaning:
+        result = Meaning()
+        spans: ResultSet[Tag] = index.nodes[position].find_all('span')
         for span in spans:
             if span.get_text().strip() != '':
-                result['part_of_speech'] = span.get_text().strip().lower()
-                next_sibling: Tag = header.find_next_sibling()
-                while next_sibling.name == 'table':
-                    next_sibling = next_sibling.find_next_sibling()
-                self._process_meaning_values(next_sibling, result)
+                if 'part_of_speech' in self._fields:
+                    result.part_of_speech = span.get_text().strip().lower()
+                next_position = position + 1
+                while next_position < len(index) and index.nodes[next_position].name == 'table':
+                    next_position += 1
+                with self._instrumentation.timed('process_meaning_values'):
+                    self._process_meaning_values(index, next_position, result)
                 break
         return result
 
-    def _get_meaning_with_etymology(self, header: PageElement, processed_headers) -> [Dict[str, Any]]:
-        result = {'etymology': None, 'definitions': []}
-        next_sibling: Tag = header.find_next_sibling()
+    def _get_meaning_with_etymology(self,
+                                    index: SectionIndex,
+                                    position: int,
+                                    processed_headers: Set[int]) -> Meaning:
+        result = Meaning()
+        next_position = position + 1
         # p is etymology details, capture it
-        while next_sibling.name == 'p':
-            p: NavigableString = header.find_next_sibling()
-            etymology = result.get('etymology')
-            result['etymology'] = p.get_text().strip() if etymology is None \
-                else etymology + '\n' + p.get_text().strip()
-            next_sibling = next_sibling.find_next_sibling()
+        while next_position < len(index) and index.nodes[next_position].name == 'p':
+            if 'etymology' in self._fields:
+                p: Tag = index.nodes[position + 1]
+                etymology = result.etymology
+                result.etymology = p.get_text().strip() if etymology is None \
+                    else etymology + '\n' + p.get_text().strip()
+            next_position += 1
         # Skip pronunciation headers
-        while self._is_pronunciation_header(next_sibling) or next_sibling.name == 'ul':
-            next_sibling = next_sibling.find_next_sibling()
+        while next_position < len(index) and (
+                index.is_pronunciation[next_position] or index.nodes[next_position].name == 'ul'):
+            next_position += 1
         # h4 is the header for parts of speech
-        if is_part_of_speech_header(next_sibling):
-            span: NavigableString = next_sibling.find('span')
+        if next_position < len(index) and index.is_part_of_speech[next_position]:
+            header = index.nodes[next_position]
+            span: NavigableString = header.find('span') if 'part_of_speech' in self._fields else None
             if span:
-                result['part_of_speech'] = span.get_text().strip().lower()
-            if next_sibling.name == 'h3':
-                processed_headers.append(str(next_sibling))
-            next_sibling = next_sibling.find_next_sibling()
-            self._process_meaning_values(next_sibling, result)
+                result.part_of_speech = span.get_text().strip().lower()
+            if header.name == 'h3':
+                processed_headers.add(next_position)
+            with self._instrumentation.timed('process_meaning_values'):
+                self._process_meaning_values(index, next_position + 1, result)
         return result
 
-    def _process_meaning_values(self, word_p: PageElement, meaning: Dict[str, Any]):
-        next_sibling: PageElement = word_p
-        if next_sibling.name == 'p':
-            meaning['metadata'] = next_sibling.get_text().strip()
-        if next_sibling.name in ['p', 'div', 'pre', 'figure', 'table']:
-            next_sibling = next_sibling.find_next_sibling(name=['ol', 'dl'])
-        meaning_sibling = next_sibling
-        while meaning_sibling and meaning_sibling.name in ['ol', 'dl']:
-            # element_tag = 'dd' if next_sibling.name == 'dl' else 'li'
-            lis: ResultSet[PageElement] = meaning_sibling.find_all(name=['dd', 'li'], recursive=False)
-            for li in lis:
-                remove_descendants_with_class(li, 'HQToggle')
-                remove_parent_of_descendant_with_class(li, 'citation-whole')
-                examples = find_usage_examples(li)
-
-                value = {
-                    'text': li.get_text().strip(),
-                    'examples': examples
-                }
-                meaning['definitions'].append(value)
-            meaning_sibling = meaning_sibling.find_next_sibling()
-            self._process_additional_data(next_sibling, meaning)
-
-    def _process_additional_data(self, after_meaning_values: PageElement, meaning: Dict[str, Any]) -> None:
-        if after_meaning_values is not None and meaning['definitions']:
-            next_sibling = after_meaning_values
-            while next_sibling is not None and not self._is_meaning_switcher(next_sibling):
-                for response_field, html_id in self._additional_data.items():
-                    process_by_id(next_sibling, meaning, response_field, html_id)
-
-                next_sibling = next_sibling.find_next_sibling()
-
-    def _is_meaning_switcher(self, header: PageElement):
-        return self._is_pronunciation_header(header) \
-               or self._is_etymology_header(header) \
-               or is_part_of_speech_header(header)
-
-    def _is_etymology_header(self, header: PageElement) -> bool:
-        if header.find_all('span', string=re.compile(self._to_language.etymology + '.*')):
-            return True
-        return False
-
-    def _process_pronunciation(self, root: BeautifulSoup) -> None:
-        audio_entries = root.find_all('audio')
+    def _process_meaning_values(self, index: SectionIndex, position: int, meaning: Meaning):
+        word_p = index.get(position)
+        if word_p is None:
+            return
+        if word_p.name == 'p' and 'metadata' in self._fields:
+            meaning.metadata = word_p.get_text().strip()
+        if word_p.name in ['p', 'div', 'pre', 'figure', 'table']:
+            position = index.next_list[position]
+            if position is None:
+                return
+        first_list = position
+        found_definitions = False
+        with_definitions = 'definitions' in self._fields
+        with_examples = 'examples' in self._fields
+        while position < len(index) and index.nodes[position].name in ['ol', 'dl']:
+            lis: ResultSet[PageElement] = index.nodes[position].find_all(name=['dd', 'li'], recursive=False)
+            found_definitions = found_definitions or bool(lis)
+            if with_definitions:
+                skipped = index.skipped
+                for li in lis:
+                    skip_descendants_with_class(li, 'HQToggle', skipped)
+                    skip_parent_of_descendant_with_class(li, 'citation-whole', skipped)
+                    if with_examples:
+                        examples = find_usage_examples(li, skipped)
+                    else:
+                        examples = []
+                        dl = find_kept(li, skipped, 'dl')
+                        if dl:
+                            skipped.add(id(dl))
+                    meaning.definitions.append(Definition(get_kept_text(li, skipped).strip(), examples))
+            position += 1
+        if found_definitions and self._list_fields:
+            with self._instrumentation.timed('process_additional_data'):
+                self._process_additional_data(index, first_list, meaning)
+
+    def _process_additional_data(self, index: SectionIndex, position: int, meaning: Meaning) -> None:
+        while position < len(index) and not index.is_meaning_switcher(position):
+            for response_field in index.additional_data[position]:
+                if response_field not in self._list_fields:
+                    continue
+                ul = index.get(position + 1)
+                if ul is not None and ul.name == 'ul':
+                    result = [li.get_text() for li in ul.find_all('li')]
+                    if result:
+                        setattr(meaning, response_field, result)
+            position += 1
+
+    def _process_pronunciation(self, index: Optional[SectionIndex], response: WordResult) -> None:
+        audio_entries = []
+        if index is not None:
+            for node in index.nodes:
+                if node.name == 'audio':
+                    audio_entries.append(node)
+                audio_entries.extend(find_all_kept(node, index.skipped, 'audio'))
         pronunciations = []
-        if 'pronunciation' in self.response:
-            pronunciations = self.response['pronunciation']
+        if response.pronunciation is not None:
+            pronunciations = response.pronunciation
         for audio_entry in audio_entries:
             sources = audio_entry.find_all('source')
             if not sources:
                 continue
-            pronunciation_values = []
-            pronunciation = {'type': 'Audio', 'values': pronunciation_values}
+            pronunciation = Pronunciation('Audio')
             for source in sources:
-                pronunciation_values.append({
-                    'type': source.attrs['type'],
-                    'value': source.attrs['src'],
-                })
+                pronunciation.values.append(PronunciationValue(source.attrs['type'], source.attrs['src']))
             pronunciations.append(pronunciation)
 
-        self.response['pronunciation'] = pronunciations
+        response.pronunciation = pronunciations
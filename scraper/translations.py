@@ -0,0 +1,172 @@
+import html as html_module
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from bs4 import NavigableString, Tag
+
+from scraper.model import Translation
+from scraper.scraper import parse_html
+from scraper.transport import Transport, get_default_transport
+
+# A complete section header or translations table, the tables do not contain other tables or headers
+_ITEM = re.compile(r'<h([2-6])\b[^>]*>.*?</h\1\s*>|<table\b[^>]*\bclass="translations"[^>]*>.*?</table\s*>', re.S)
+_ITEM_START = re.compile(r'<h[2-6]\b|<table\b[^>]*\bclass="translations"')
+# The text of a header follows the element carrying its id, the h tag itself or its mw-headline span
+_HEADLINE = re.compile(r'\bid="[^"]*"[^>]*>([^<]*)<')
+_TAG = re.compile(r'<[^>]*>')
+
+
+def _header_text(header: str) -> str:
+    match = _HEADLINE.search(header)
+    text = match.group(1) if match else _TAG.sub('', header)
+    return html_module.unescape(text).strip()
+
+
+class TranslationTableSlicer:
+    """
+    Cuts the translations tables out of a page fed in chunks, keeping no more of the page in memory than
+    the table or header being read. Each table comes with the part of speech it is listed under.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self._headers: List[Tuple[int, str]] = []
+
+    def feed(self, text: str) -> List[Tuple[Optional[str], str]]:
+        """
+        Add the next chunk of the page. Returns the (part of speech, table HTML) pairs of the tables it completes.
+        """
+        buffer = self._buffer + text
+        tables = []
+        end = 0
+        for match in _ITEM.finditer(buffer):
+            end = match.end()
+            if match.group(1) is not None:
+                level = int(match.group(1))
+                while self._headers and self._headers[-1][0] >= level:
+                    self._headers.pop()
+                self._headers.append((level, _header_text(match.group(0))))
+            else:
+                tables.append((self._part_of_speech(), match.group(0)))
+        # Keep a header or table which is still open, or a tag split between chunks which may start one
+        start = _ITEM_START.search(buffer, end)
+        if start is not None:
+            end = start.start()
+        else:
+            tag = buffer.rfind('<', end)
+            end = tag if tag != -1 and buffer.find('>', tag) == -1 else len(buffer)
+        self._buffer = buffer[end:]
+        return tables
+
+    def _part_of_speech(self) -> Optional[str]:
+        # The table is under a Translations header, which is under the header of the part of speech.
+        # It is lowercased like the part_of_speech of meanings, so that the two can be joined.
+        if len(self._headers) >= 2 and self._headers[-2][0] > 2:
+            return self._headers[-2][1].strip().lower()
+        return None
+
+
+def parse_translation_table(table_html: str,
+                            part_of_speech: Optional[str] = None,
+                            parser: Optional[str] = None) -> Iterator[Translation]:
+    """
+    The rows of a translations table, one for every term of every language listed in it.
+    The sense of the rows is the gloss of the table, which says which meaning of the word it translates.
+    """
+    table = parse_html(table_html, parser).find('table')
+    if table is None:
+        return
+    sense = table.get('data-gloss')
+    for line in table.find_all(['li', 'dd']):
+        language = _language_name(line)
+        if language is None:
+            continue
+        rows: List[Translation] = []
+        current: Optional[Translation] = None
+        qualifier: Optional[str] = None
+        for element in _line_elements(line):
+            if isinstance(element, NavigableString):
+                # Terms are separated by commas, a qualifier after a comma belongs to the next term
+                if ',' in element:
+                    current = None
+                continue
+            classes = element.get('class') or []
+            if element.get('lang') is not None and 'tr' not in classes:
+                current = Translation(language, element['lang'], element.get_text(), sense, part_of_speech,
+                                      qualifier=qualifier)
+                qualifier = None
+                rows.append(current)
+            elif 'ib-content' in classes or 'qualifier-content' in classes:
+                if current is None:
+                    qualifier = element.get_text()
+                else:
+                    current.qualifier = element.get_text()
+            elif current is None:
+                continue
+            elif 'tr' in classes:
+                current.transliteration = element.get_text()
+            elif 'gender' in classes:
+                # Genders and numbers are separated by non-breaking spaces, as in m\xa0pl
+                current.gender = ' '.join(element.get_text().split())
+            elif 'mention-gloss' in classes:
+                current.gloss = element.get_text()
+        yield from rows
+
+
+def _language_name(line: Tag) -> Optional[str]:
+    """
+    The language of a line of a translations table. Lines nested in the line of a language, for its varieties
+    or scripts, are named after both, as in Chinese: Mandarin.
+    """
+    child = next(iter(line.children), None)
+    if not isinstance(child, NavigableString):
+        return None
+    name, colon, _ = child.partition(':')
+    if not colon:
+        return None
+    name = name.strip()
+    if line.name == 'dd':
+        parent = line.find_parent(['li', 'dd'])
+        parent_name = _language_name(parent) if parent is not None else None
+        if parent_name is not None:
+            name = f'{parent_name}: {name}'
+    return name
+
+
+def _line_elements(line: Tag) -> Iterator[Union[Tag, NavigableString]]:
+    # Translations to be checked are wrapped in a ttbc span, the lines of varieties of the language are nested lists
+    for child in line.children:
+        if isinstance(child, Tag):
+            if child.name in ['dl', 'ul', 'sup']:
+                continue
+            if 'ttbc' in (child.get('class') or []):
+                yield from _line_elements(child)
+                continue
+        yield child
+
+
+def iter_translations(chunks: Iterable[str], parser: Optional[str] = None) -> Iterator[Translation]:
+    """
+    Extract the rows of every translations table of a page given in chunks of text, in the layout of
+    en.wiktionary.org. Each table is parsed on its own as soon as it is complete, so the rows are produced
+    while the page is still being read, and the page is never parsed as a whole.
+    """
+    slicer = TranslationTableSlicer()
+    for chunk in chunks:
+        for part_of_speech, table_html in slicer.feed(chunk):
+            yield from parse_translation_table(table_html, part_of_speech, parser)
+
+
+def scrape_translations(word: str,
+                        base_url: str = 'https://en.wiktionary.org',
+                        transport: Optional[Transport] = None,
+                        parser: Optional[str] = None,
+                        typed: bool = False) -> Iterator[Union[Dict[str, Any], Translation]]:
+    """
+    Stream the page of a word and extract every translation listed on it, as dicts, or as Translation records
+    if typed is set. A single fetch gives the translations into all languages.
+    """
+    if transport is None:
+        transport = get_default_transport()
+    for translation in iter_translations(transport.iter_html(f'{base_url}/wiki/{word}'), parser):
+        yield translation if typed else translation.to_dict()
@@ -0,0 +1,367 @@
+import codecs
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scraper.cache import HttpCache
+from scraper.instrumentation import DISABLED, Instrumentation
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class FetchError(FileNotFoundError):
+    """
+    A page could not be fetched. It is a FileNotFoundError, which get_html raised for every failed request before.
+    """
+
+    def __init__(self, message: str, url: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.url = url
+        self.status_code = status_code
+
+
+class PageNotFoundError(FetchError):
+    """
+    The wiki has no page for the word, retrying will not help.
+    """
+
+
+class TransientError(FetchError):
+    """
+    The page could not be fetched because of throttling, a server error, a timeout or a connection problem,
+    even after retrying. Retrying later may succeed.
+    """
+
+
+class CircuitOpenError(TransientError):
+    """
+    The request was not sent because the wiki host failed too many times in a row.
+    """
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter between the attempts of a request which failed transiently.
+    """
+
+    def __init__(self,
+                 retries: int = 3,
+                 backoff: float = 0.5,
+                 max_backoff: float = 30.0,
+                 statuses: Iterable[int] = (429, 500, 502, 503, 504)):
+        """
+        :param retries: The number of attempts after the first one
+        :param backoff: The upper bound of the first delay in seconds, doubled for every further attempt
+        :param max_backoff: The longest delay in seconds, also applied to Retry-After headers
+        :param statuses: The status codes which are retried
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        The seconds to wait before the given retry, counting from 0. A Retry-After from the server takes precedence.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.backoff * 2 ** attempt, self.max_backoff))
+
+
+NO_RETRY = RetryPolicy(retries=0)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait according to a Retry-After header, which is either a number of seconds or an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Lets through requests_per_second requests per second on average, with bursts of up to burst requests.
+    """
+
+    def __init__(self, requests_per_second: float, burst: Optional[float] = None):
+        self._rate = requests_per_second
+        self._capacity = burst or max(requests_per_second, 1.0)
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Stops requests to a host after failure_threshold transient failures in a row. After reset_timeout seconds
+    a single trial request is let through, which closes the circuit again if it succeeds.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial or time.monotonic() - self._opened_at < self._reset_timeout:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self._failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial = False
+
+
+class Transport:
+
+    def __init__(self,
+                 pool_size: int = 10,
+                 timeout: Optional[Timeout] = (5.0, 30.0),
+                 cache: Optional[HttpCache] = None,
+                 instrumentation: Optional[Instrumentation] = None,
+                 retry: Optional[RetryPolicy] = None,
+                 requests_per_second: Optional[float] = None,
+                 burst: Optional[float] = None,
+                 failure_threshold: int = 5,
+                 reset_timeout: float = 30.0):
+        """
+        :param pool_size: The maximum number of keep-alive connections kept open per wiki host
+        :param timeout: Seconds to wait for the server, either a single value or a (connect, read) tuple
+        :param cache: A persistent cache pages are served from and stored in
+        :param instrumentation: Receives the timings of the fetch and decode stages and the number of fetched bytes
+        :param retry: How throttled, failed and timed out requests are retried. Pass NO_RETRY to fail at once.
+        :param requests_per_second: The maximum average number of requests sent to a single wiki host per second
+        :param burst: The number of requests which may be sent to a host at once. Defaults to requests_per_second.
+        :param failure_threshold: The number of transient failures in a row after which requests to a host fail
+        immediately with CircuitOpenError
+        :param reset_timeout: Seconds after which a request is let through to a host whose circuit is open
+        """
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.cache = cache
+        self.instrumentation = instrumentation or DISABLED
+        self.retry = retry or RetryPolicy()
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._sessions: Dict[str, requests.Session] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get_html(self, url: str) -> str:
+        return ''.join(self.iter_html(url))
+
+    def iter_html(self, url: str, chunk_size: int = 64 * 1024) -> Iterator[str]:
+        """
+        Stream the page as decoded text in chunks, so that the raw page never needs to be held in memory as a whole.
+        Pages are transferred compressed with gzip, or with brotli if the brotli package is installed.
+        Closing the iterator early closes the connection. Pages stored in the cache are still collected as a whole.
+        """
+        entry = None
+        headers = {}
+        if self.cache is not None:
+            entry = self.cache.get(url)
+            if entry is not None:
+                if self.cache.is_fresh(entry):
+                    self.cache.record('hits')
+                    yield entry.html
+                    return
+                if entry.etag:
+                    headers['If-None-Match'] = entry.etag
+                if entry.last_modified:
+                    headers['If-Modified-Since'] = entry.last_modified
+
+        response = self._fetch(url, headers)
+        failed = False
+        try:
+            code = response.status_code
+            if code != 200:
+                # Reading the short body of other responses lets their connection be reused
+                response.content
+            if code == 304 and entry is not None:
+                self.cache.refresh(url)
+                self.cache.record('revalidations')
+                yield entry.html
+                return
+            if code == 404 or code == 410:
+                raise PageNotFoundError(f'URL not found with status code {code}: {url}', url, code)
+            if code != 200:
+                raise FetchError(f'URL could not be fetched with status code {code}: {url}', url, code)
+            parts = [] if self.cache is not None else None
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            for chunk in response.iter_content(chunk_size):
+                self.instrumentation.count('bytes_fetched', len(chunk))
+                with self.instrumentation.timed('decode'):
+                    text = decoder.decode(chunk)
+                if parts is not None:
+                    parts.append(text)
+                if text:
+                    yield text
+            text = decoder.decode(b'', final=True)
+            if text:
+                yield text
+            if parts is not None:
+                self.cache.record('misses')
+                self.cache.put(url, ''.join(parts) + text, response.headers.get('ETag'),
+                               response.headers.get('Last-Modified'))
+        except requests.RequestException as e:
+            # A body which is cut short or whose compression is corrupt fails the request like a failed connection
+            failed = True
+            raise TransientError(f'URL could not be fetched: {url}: {e}', url)
+        except UnicodeDecodeError as e:
+            # A page which is not UTF-8 stays so when it is fetched again
+            failed = True
+            raise FetchError(f'URL could not be decoded: {url}: {e}', url, response.status_code)
+        finally:
+            response.close()
+            # The host only counts as healthy once the body has been read
+            breaker = self.get_breaker(url)
+            if failed:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+    def _fetch(self, url: str, headers: Dict[str, str]) -> requests.Response:
+        """
+        Send the request, retrying throttled, failed and timed out attempts with backoff.
+        """
+        session = self.get_session(url)
+        bucket = self.get_bucket(url)
+        breaker = self.get_breaker(url)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f'Too many failures, not requesting: {url}', url)
+            if bucket is not None:
+                bucket.acquire()
+            retry_after = None
+            try:
+                with self.instrumentation.timed('fetch'):
+                    response = session.get(url, headers=headers, timeout=self.timeout, stream=True)
+                if response.status_code in self.retry.statuses:
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    response.content
+                    response.close()
+            except requests.RequestException as e:
+                error = TransientError(f'URL could not be fetched: {url}: {e}', url)
+            else:
+                if response.status_code not in self.retry.statuses:
+                    return response
+                error = TransientError(f'URL could not be fetched with status code {response.status_code}: {url}',
+                                       url, response.status_code)
+            breaker.record_failure()
+            if attempt >= self.retry.retries:
+                raise error
+            self.instrumentation.count('retries')
+            time.sleep(self.retry.delay(attempt, retry_after))
+            attempt += 1
+
+    def get_session(self, url: str) -> requests.Session:
+        host = urlsplit(url).netloc
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+            return session
+
+    def get_bucket(self, url: str) -> Optional[TokenBucket]:
+        if not self.requests_per_second:
+            return None
+        host = urlsplit(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.requests_per_second, self.burst)
+            return bucket
+
+    def get_breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return breaker
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def __enter__(self) -> 'Transport':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+_default_transport: Optional[Transport] = None
+_default_transport_lock = threading.Lock()
+
+
+def get_default_transport() -> Transport:
+    global _default_transport
+    with _default_transport_lock:
+        if _default_transport is None:
+            _default_transport = Transport()
+        return _default_transport
+
+
+def set_default_transport(transport: Transport) -> None:
+    global _default_transport
+    with _default_transport_lock:
+        _default_transport = transport
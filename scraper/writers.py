@@ -0,0 +1,240 @@
+import csv
+import gzip
+import io
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, TextIO, Union
+
+from scraper.model import MEANING_LIST_FIELDS
+
+TABLES: Dict[str, List[str]] = {
+    'meanings': ['word', 'from_language', 'to_language', 'meaning_index',
+                 'part_of_speech', 'etymology', 'metadata'] + MEANING_LIST_FIELDS,
+    'definitions': ['word', 'from_language', 'to_language', 'meaning_index', 'definition_index', 'text'],
+    'examples': ['word', 'from_language', 'to_language', 'meaning_index', 'definition_index', 'example_index',
+                 'example', 'translation'],
+    'pronunciations': ['word', 'from_language', 'to_language', 'pronunciation_index', 'type',
+                       'value_index', 'value_type', 'value'],
+}
+
+
+def flatten(response: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Flatten a response into rows of the meanings, definitions, examples and pronunciations tables.
+    Rows are linked to their response by the word and languages, and to their parents by the indexes.
+    """
+    key = {
+        'word': response['word'],
+        'from_language': response['from_language'],
+        'to_language': response['to_language'],
+    }
+    tables = {table: [] for table in TABLES}
+    for meaning_index, meaning in enumerate(response['meanings']):
+        row = {**key, 'meaning_index': meaning_index}
+        for column in TABLES['meanings'][4:]:
+            row[column] = meaning.get(column)
+        tables['meanings'].append(row)
+        for definition_index, definition in enumerate(meaning['definitions']):
+            tables['definitions'].append({
+                **key,
+                'meaning_index': meaning_index,
+                'definition_index': definition_index,
+                'text': definition['text'],
+            })
+            for example_index, example in enumerate(definition['examples']):
+                tables['examples'].append({
+                    **key,
+                    'meaning_index': meaning_index,
+                    'definition_index': definition_index,
+                    'example_index': example_index,
+                    'example': example['example'],
+                    'translation': example['translation'],
+                })
+    for pronunciation_index, pronunciation in enumerate(response.get('pronunciation', [])):
+        for value_index, value in enumerate(pronunciation['values']):
+            tables['pronunciations'].append({
+                **key,
+                'pronunciation_index': pronunciation_index,
+                'type': pronunciation['type'],
+                'value_index': value_index,
+                'value_type': value['type'],
+                'value': value['value'],
+            })
+    return tables
+
+
+def open_text(path: Union[str, Path], compression: Optional[str] = None, append: bool = False) -> TextIO:
+    """
+    Open a text file for writing, compressed with gzip or zstd if asked for or if the file extension says so.
+    If append is set, writing continues at the end of an existing file, in a new compressed stream if compressed.
+    """
+    path = str(path)
+    mode = 'a' if append else 'w'
+    if compression is None:
+        if path.endswith('.gz'):
+            compression = 'gzip'
+        elif path.endswith('.zst'):
+            compression = 'zstd'
+    if compression == 'gzip':
+        return gzip.open(path, f'{mode}t', encoding='utf-8')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError('zstd compression requires the zstandard package: pip install wkt_scraper[zstd]')
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(open(path, f'{mode}b')), encoding='utf-8')
+    if compression is not None:
+        raise ValueError(f'Unsupported compression {compression}, expected gzip or zstd')
+    return open(path, f'{mode}t', encoding='utf-8')
+
+
+class JsonLinesWriter:
+    """
+    Writes responses as JSON lines, one response per line, flushing every batch_size responses.
+    """
+
+    def __init__(self,
+                 output: Union[str, Path, TextIO],
+                 compression: Optional[str] = None,
+                 batch_size: int = 1000,
+                 append: bool = False):
+        """
+        :param output: A file path, or an open text file which is left open on close
+        :param compression: gzip or zstd. By default it is chosen from the file extension (.gz, .zst).
+        :param batch_size: The number of responses buffered before they are written out
+        :param append: Add to the end of the file at the path instead of replacing it
+        """
+        self._owns_output = isinstance(output, (str, Path))
+        self._output = open_text(output, compression, append) if self._owns_output else output
+        self._batch_size = batch_size
+        self._batch: List[str] = []
+        self.count = 0
+
+    def write(self, response: Dict[str, Any]) -> None:
+        self._batch.append(json.dumps(response, ensure_ascii=False))
+        self.count += 1
+        if len(self._batch) >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._batch:
+            self._output.write('\n'.join(self._batch))
+            self._output.write('\n')
+            self._batch = []
+        self._output.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._owns_output:
+            self._output.close()
+
+    def __enter__(self) -> 'JsonLinesWriter':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+class ColumnarWriter:
+    """
+    Writes flattened responses into one file per table (meanings, definitions, examples, pronunciations),
+    one batch of batch_size responses at a time. The files are CSV, or Parquet if pyarrow is installed and asked for.
+    """
+
+    def __init__(self, directory: Union[str, Path], file_format: str = 'csv', batch_size: int = 1000):
+        """
+        :param directory: The directory the table files are written to. It is created if it does not exist.
+        :param file_format: csv or parquet
+        :param batch_size: The number of responses buffered before a batch of rows is written out
+        """
+        if file_format not in ['csv', 'parquet']:
+            raise ValueError(f'Unsupported file format {file_format}, expected csv or parquet')
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._file_format = file_format
+        self._batch_size = batch_size
+        self._batch: Dict[str, List[Dict[str, Any]]] = {table: [] for table in TABLES}
+        self._batch_count = 0
+        self._files: Dict[str, Any] = {}
+        self._writers: Dict[str, Any] = {}
+        self.count = 0
+        if file_format == 'parquet':
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError:
+                raise ImportError('Parquet output requires the pyarrow package: pip install wkt_scraper[parquet]')
+            self._pyarrow = pyarrow
+            self._parquet = pyarrow.parquet
+
+    def write(self, response: Dict[str, Any]) -> None:
+        for table, rows in flatten(response).items():
+            self._batch[table].extend(rows)
+        self._batch_count += 1
+        self.count += 1
+        if self._batch_count >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        for table, rows in self._batch.items():
+            if self._file_format == 'csv':
+                self._write_csv(table, rows)
+            else:
+                self._write_parquet(table, rows)
+        self._batch = {table: [] for table in TABLES}
+        self._batch_count = 0
+
+    def _write_csv(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        writer = self._writers.get(table)
+        if writer is None:
+            file = open(self._directory / f'{table}.csv', 'w', encoding='utf-8', newline='')
+            writer = csv.DictWriter(file, fieldnames=TABLES[table])
+            writer.writeheader()
+            self._files[table] = file
+            self._writers[table] = writer
+        for row in rows:
+            writer.writerow({column: json.dumps(value, ensure_ascii=False) if isinstance(value, list) else value
+                             for column, value in row.items()})
+        self._files[table].flush()
+
+    def _write_parquet(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        pyarrow = self._pyarrow
+        writer = self._writers.get(table)
+        if writer is None:
+            fields = []
+            for column in TABLES[table]:
+                if column.endswith('_index'):
+                    fields.append(pyarrow.field(column, pyarrow.int32()))
+                elif column in MEANING_LIST_FIELDS:
+                    fields.append(pyarrow.field(column, pyarrow.list_(pyarrow.string())))
+                else:
+                    fields.append(pyarrow.field(column, pyarrow.string()))
+            writer = self._parquet.ParquetWriter(str(self._directory / f'{table}.parquet'), pyarrow.schema(fields))
+            self._writers[table] = writer
+        if rows:
+            writer.write_table(pyarrow.Table.from_pylist(rows, schema=writer.schema))
+
+    def close(self) -> None:
+        self.flush()
+        for writer in self._writers.values():
+            if self._file_format == 'parquet':
+                writer.close()
+        for file in self._files.values():
+            file.close()
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def write_responses(responses: Iterable[Dict[str, Any]], writer: Union[JsonLinesWriter, ColumnarWriter]) -> int:
+    """
+    Write responses as they are produced, without holding them in memory. Returns the number of written responses.
+    """
+    count = 0
+    for response in responses:
+        writer.write(response)
+        count += 1
+    return count
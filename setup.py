@@ -25,4 +25,13 @@ setup(
     include_package_data=True,
     url='https://github.com/fatih-akgul/wkt_scraper',
     install_requires=['beautifulsoup4', 'requests'],
+    entry_points={
+        'console_scripts': ['wkt-scraper=scraper.cli:main'],
+    },
+    extras_require={
+        'brotli': ['brotli'],
+        'lxml': ['lxml'],
+        'parquet': ['pyarrow'],
+        'zstd': ['zstandard'],
+    },
 )
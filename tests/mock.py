@@ -1,11 +1,41 @@
+import html
 import os
+import re
 from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+from scraper import Scraper
 
 current_path = Path(os.path.dirname(os.path.realpath(__file__)))
 test_resources = current_path / "resources"
 
+# (from_language, to_language, word) of every page under test resources which the tests scrape
+fixture_cases = [
+    ('en', 'en', 'complicated'),
+    ('en', 'en', 'foobar'),
+    ('en', 'es', 'street'),
+    ('en', 'tr', 'street'),
+    ('en', 'tr', 'car'),
+    ('es', 'en', 'aprender'),
+    ('es', 'es', 'aprender'),
+    ('tr', 'en', 'foobar'),
+    ('tr', 'en', 'gibi'),
+    ('tr', 'en', 'el'),
+    ('tr', 'en', 'araba'),
+    ('tr', 'tr', 'araba'),
+]
+
+
+# Titles under test resources which redirect to another page, per wiki
+fixture_redirects = {
+    'en': {'Gibi': 'gibi', 'arabalar': 'araba'},
+}
+
 
-def mock_get_html(url: str) -> str:
+def mock_get_html(url: str, *_) -> str:
     filename = f"{url.replace('/', '-')}.html"
     html = get_test_resource_text(filename)
     return html
@@ -17,3 +47,104 @@ def get_test_resource(filename: str) -> Path:
 
 def get_test_resource_text(filename: str) -> str:
     return get_test_resource(filename).read_text()
+
+
+def fixture_resource(to_language: str, word: str) -> Path:
+    """
+    The saved page of a word on the wiki of to_language, which may not exist.
+    """
+    return get_test_resource(f'https:--{to_language}.wiktionary.org-wiki-{word}.html')
+
+
+def fixture_html(to_language: str, word: str) -> str:
+    return fixture_resource(to_language, word).read_text()
+
+
+def expected_response(from_language: str, to_language: str, word: str) -> Dict[str, Any]:
+    """
+    The response of scraping the saved page of a word, to compare the responses of other ways of scraping it with.
+    """
+    with patch('scraper.scraper.get_html', side_effect=mock_get_html):
+        return Scraper(from_language, to_language).scrape(word)
+
+
+def get_content_sections(page: str) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    The content HTML of a rendered page, and its headings with their positions in it.
+    """
+    start = page.index('<div class="mw-parser-output">') + len('<div class="mw-parser-output">')
+    end = page.find('NewPP limit report', start)
+    content = page[start:] if end == -1 else page[start:page.rfind('<!--', start, end)]
+    sections = []
+    for heading in re.finditer(r'<h([2-6])>(.*?)</h\1>', content, re.DOTALL):
+        anchor = re.search(r'class="mw-headline" id="([^"]*)"', heading.group(2))
+        if anchor is None:
+            continue
+        headline = re.sub(r'<span class="mw-editsection">.*', '', heading.group(2), flags=re.DOTALL)
+        sections.append({
+            'toclevel': int(heading.group(1)) - 1,
+            'level': heading.group(1),
+            'line': html.unescape(re.sub(r'<[^>]+>', '', headline)).strip(),
+            'index': str(len(sections) + 1),
+            'anchor': anchor.group(1),
+            'start': heading.start(),
+        })
+    return content, sections
+
+
+def mock_api_response(to_language: str, params: Dict[str, str]) -> Dict[str, Any]:
+    """
+    What the parse API of a wiki answers for the rendered page of the word under test resources.
+    Only the sections and text of a page or one of its sections, and queries of titles are supported.
+    """
+    if params.get('action') == 'query':
+        return mock_query_response(to_language, params['titles'].split('|'))
+    resource = fixture_resource(to_language, params['page'])
+    if not resource.exists():
+        return {'error': {'code': 'missingtitle', 'info': "The page you specified doesn't exist."}}
+    content, sections = get_content_sections(resource.read_text())
+    result = {'title': params['page']}
+    if params.get('prop') == 'sections':
+        result['sections'] = [{key: value for key, value in section.items() if key != 'start'}
+                              for section in sections]
+    elif params.get('prop') == 'text':
+        text = content
+        if 'section' in params:
+            section = next(section for section in sections if section['index'] == params['section'])
+            end = next((other['start'] for other in sections
+                        if other['start'] > section['start'] and other['level'] <= section['level']), len(content))
+            text = content[section['start']:end]
+        if params.get('disableeditsection'):
+            soup = BeautifulSoup(text, 'html.parser')
+            for element in soup.find_all(class_='mw-editsection'):
+                element.decompose()
+            text = str(soup)
+        result['text'] = f'<div class="mw-parser-output">{text}</div>'
+    return {'parse': result}
+
+
+def mock_query_response(to_language: str, titles: List[str]) -> Dict[str, Any]:
+    """
+    What the query API of a wiki answers for titles, of which only those under test resources exist.
+    """
+    normalized = []
+    redirects = []
+    pages = {}
+    for title in titles:
+        target = title.replace('_', ' ').strip()
+        if target != title:
+            normalized.append({'fromencoded': False, 'from': title, 'to': target})
+        redirect = fixture_redirects.get(to_language, {}).get(target)
+        if redirect is not None:
+            redirects.append({'from': target, 'to': redirect})
+            target = redirect
+        page = {'ns': 0, 'title': target}
+        if not fixture_resource(to_language, target).exists():
+            page['missing'] = True
+        pages[target] = page
+    query = {'pages': list(pages.values())}
+    if normalized:
+        query['normalized'] = normalized
+    if redirects:
+        query['redirects'] = redirects
+    return {'batchcomplete': True, 'query': query}
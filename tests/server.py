@@ -0,0 +1,131 @@
+import gzip
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, List
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from tests.mock import fixture_resource, mock_api_response
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.record_request(self)
+        if urlsplit(self.path).path.endswith('/w/api.php'):
+            self._send_api_response()
+            return
+        # Paths look like /<language>/wiki/<word>, served from the matching test resource
+        parts = unquote(self.path).split('/')
+        fault = self.server.next_fault(parts[-1])
+        if fault is not None:
+            if fault.delay:
+                time.sleep(fault.delay)
+            self._send(fault.status_code, fault.body, headers=fault.headers)
+            return
+        resource = None
+        if len(parts) == 4 and parts[2] == 'wiki':
+            resource = fixture_resource(parts[1], parts[3])
+        if resource is None or not resource.exists():
+            self._send(404, b'Not found')
+            return
+        body = resource.read_bytes()
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if self.headers.get('If-None-Match') == etag:
+            self._send(304, b'', etag)
+        elif self.server.compress and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            self._send(200, gzip.compress(body), etag, {'Content-Encoding': 'gzip'})
+        else:
+            self._send(200, body, etag)
+
+    def _send_api_response(self):
+        # Paths look like /<language>/w/api.php?action=parse&page=<word>&...
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        fault = self.server.next_fault(params.get('page'))
+        if fault is not None:
+            self._send(fault.status_code, fault.body, headers=fault.headers)
+            return
+        body = json.dumps(mock_api_response(url.path.split('/')[1], params)).encode('utf-8')
+        self._send(200, body, headers={'Content-Type': 'application/json; charset=utf-8'})
+
+    def _send(self, code: int, body: bytes, etag: str = None, headers: Dict[str, str] = None):
+        self.server.record_response(code)
+        self.send_response(code)
+        headers = {'Content-Type': 'text/html; charset=UTF-8', **(headers or {})}
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_):
+        pass
+
+
+class Fault:
+
+    def __init__(self, status_code: int, headers: Dict[str, str] = None, delay: float = 0, body: bytes = b'Fault'):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.delay = delay
+        self.body = body
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """
+    A local stand-in for the Wiktionary web servers which serves the pages under tests/resources.
+    """
+    daemon_threads = True
+
+    def __init__(self, compress: bool = False):
+        """
+        :param compress: Send pages gzip compressed to clients which accept it
+        """
+        super().__init__(('127.0.0.1', 0), FixtureRequestHandler)
+        self.compress = compress
+        self.requests = []
+        self.status_codes = []
+        self.connections = set()
+        self._faults: Dict[str, List[Fault]] = {}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    def record_request(self, handler: BaseHTTPRequestHandler):
+        with self._lock:
+            self.requests.append(handler.path)
+            self.connections.add(handler.client_address)
+
+    def inject_fault(self, word: str, status_code: int, times: int = 1, headers: Dict[str, str] = None,
+                     delay: float = 0, body: bytes = b'Fault'):
+        """
+        Answer the next given number of requests for the word with the status code and body,
+        after sleeping for delay seconds.
+        """
+        with self._lock:
+            self._faults.setdefault(word, []).extend(Fault(status_code, headers, delay, body) for _ in range(times))
+
+    def next_fault(self, word: str):
+        with self._lock:
+            faults = self._faults.get(word)
+            return faults.pop(0) if faults else None
+
+    def record_response(self, code: int):
+        with self._lock:
+            self.status_codes.append(code)
+
+    def base_url(self, language: str) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}/{language}'
+
+    def __enter__(self) -> 'FixtureServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,84 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from scraper import NO_RETRY, AsyncScraper, Transport, ascrape_many
+from tests.mock import expected_response, mock_get_html
+from tests.server import FixtureServer
+
+
+class SlowMock:
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url: str, *_) -> str:
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return mock_get_html(url)
+
+
+class AsyncScraperTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def test_bounded_concurrency(self):
+        slow_mock = SlowMock(0.05)
+        words = ['complicated', 'foobar'] * 6
+        with patch('scraper.scraper.get_html', side_effect=slow_mock):
+            async with AsyncScraper('en', 'en', concurrency=3) as async_scraper:
+                responses = [response async for response in async_scraper.scrape_many(words)]
+        self.assertEqual(len(responses), len(words))
+        self.assertEqual(slow_mock.max_active, 3)
+        expected = {word: expected_response('en', 'en', word) for word in set(words)}
+        for response in responses:
+            self.assertDictEqual(response, expected[response['word']])
+
+    async def test_rate_limit(self):
+        with FixtureServer() as server, Transport(requests_per_second=20, burst=1) as transport:
+            start = time.monotonic()
+            responses = [response async for response in ascrape_many(
+                'en', 'en', ['foobar'] * 5, concurrency=5, transport=transport, base_url=server.base_url('en'))]
+            elapsed = time.monotonic() - start
+        self.assertEqual(len(responses), 5)
+        self.assertGreaterEqual(elapsed, 0.2)
+
+    async def test_rate_limit_of_created_transport(self):
+        async with AsyncScraper('en', 'en', requests_per_second=20) as async_scraper:
+            self.assertEqual(async_scraper._transport.requests_per_second, 20)
+        with Transport() as transport:
+            with self.assertRaises(ValueError):
+                AsyncScraper('en', 'en', requests_per_second=20, transport=transport)
+
+    async def test_local_server(self):
+        with FixtureServer() as server:
+            responses = [response async for response in ascrape_many(
+                'tr', 'tr', ['araba', 'car', 'street'], base_url=server.base_url('tr'))]
+        self.assertEqual(sorted(response['word'] for response in responses), ['araba', 'car', 'street'])
+        for response in responses:
+            self.assertDictEqual(response, expected_response('tr', 'tr', response['word']))
+
+    async def test_missing_word(self):
+        with FixtureServer() as server:
+            with self.assertRaises(FileNotFoundError):
+                async for _ in ascrape_many('en', 'en', ['missing'], base_url=server.base_url('en')):
+                    pass
+
+    async def test_returns_errors(self):
+        with FixtureServer() as server, Transport(retry=NO_RETRY) as transport:
+            server.inject_fault('foobar', 503)
+            responses = [response async for response in ascrape_many(
+                'en', 'en', ['complicated', 'missing', 'foobar', 'el'], return_errors=True, transport=transport,
+                base_url=server.base_url('en'))]
+        responses = {response['word']: response for response in responses}
+        self.assertEqual(sorted(responses), ['complicated', 'el', 'foobar', 'missing'])
+        self.assertDictEqual(responses['complicated'], expected_response('en', 'en', 'complicated'))
+        self.assertDictEqual(responses['el'], expected_response('en', 'en', 'el'))
+        self.assertEqual(responses['missing']['error'], 'not_found')
+        self.assertEqual(responses['foobar']['error'], 'transient')
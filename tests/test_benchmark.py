@@ -0,0 +1,39 @@
+import unittest
+
+from benchmarks.bench_model import held_memory
+from benchmarks.run import compare, measure
+from benchmarks.synthetic import synthetic_page
+
+
+class BenchmarkTestCase(unittest.TestCase):
+
+    def test_measure(self):
+        result = measure('tr', 'en', 'word', synthetic_page('tr', 'en', etymologies=2), repeat=1)
+        self.assertEqual(sorted(result),
+                         ['allocated_blocks', 'extraction_time', 'html_size', 'parse_time', 'peak_memory'])
+        self.assertGreater(result['parse_time'], 0)
+        self.assertGreater(result['peak_memory'], 0)
+        self.assertGreater(result['allocated_blocks'], 0)
+
+    def test_compare(self):
+        baseline = {'results': {
+            'a': {'parse_time': 1.0, 'extraction_time': 1.0, 'peak_memory': 100, 'allocated_blocks': 10},
+            'b': {'parse_time': 1.0},
+        }}
+        current = {'results': {
+            'a': {'parse_time': 1.2, 'extraction_time': 1.5, 'peak_memory': 90, 'allocated_blocks': 20},
+            'b': {'parse_time': 2.0},
+            'c': {'parse_time': 5.0},
+        }}
+        regressions = compare(current, baseline, threshold=0.25)
+        self.assertEqual(len(regressions), 3)
+        self.assertTrue(regressions[0].startswith('a extraction_time'))
+        self.assertTrue(regressions[1].startswith('a allocated_blocks'))
+        self.assertTrue(regressions[2].startswith('b parse_time'))
+
+    def test_typed_results_take_less_memory(self):
+        dicts = held_memory(typed=False, copies=1)
+        records = held_memory(typed=True, copies=1)
+        self.assertEqual(dicts['results'], records['results'])
+        self.assertLess(records['bytes'], dicts['bytes'])
+
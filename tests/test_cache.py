@@ -0,0 +1,94 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from scraper import HttpCache, Transport, scrape_many
+from scraper.cache import EVICTION_BATCH_SIZE
+from tests.server import FixtureServer
+
+
+class HttpCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = Path(self._directory.name) / 'cache.sqlite'
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_hit_serves_without_network(self):
+        cache = HttpCache(self.path)
+        with FixtureServer() as server, Transport(cache=cache) as transport:
+            first = list(scrape_many('en', 'en', ['foobar'], transport=transport, base_url=server.base_url('en')))
+            second = list(scrape_many('en', 'en', ['foobar'], transport=transport, base_url=server.base_url('en')))
+        self.assertEqual(first, second)
+        self.assertEqual(server.status_codes, [200])
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+        cache.close()
+
+    def test_cache_persists(self):
+        with FixtureServer() as server:
+            url = f'{server.base_url("en")}/wiki/foobar'
+            with Transport(cache=HttpCache(self.path)) as transport:
+                html = transport.get_html(url)
+            cache = HttpCache(self.path)
+            with Transport(cache=cache) as transport:
+                self.assertEqual(transport.get_html(url), html)
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['entries'], 1)
+        self.assertLess(cache.size(), len(html))
+        cache.close()
+
+    def test_stale_entry_is_revalidated(self):
+        cache = HttpCache(self.path, ttl=0)
+        with FixtureServer() as server, Transport(cache=cache) as transport:
+            url = f'{server.base_url("en")}/wiki/complicated'
+            html = transport.get_html(url)
+            self.assertEqual(transport.get_html(url), html)
+        self.assertEqual(server.status_codes, [200, 304])
+        self.assertEqual(cache.revalidations, 1)
+        cache.close()
+
+    def test_size_based_eviction(self):
+        cache = HttpCache(self.path)
+        cache.put('a', 'a' * 1000)
+        cache.put('b', 'b' * 1000)
+        cache.put('c', 'c' * 1000)
+        cache.get('a')
+        single_size = cache.size() // 3
+        self.assertEqual(cache.evict(single_size * 2), 1)
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+        cache.close()
+
+        cache = HttpCache(self.path, max_size=single_size)
+        cache.put('d', 'd' * 1000)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get('d').html, 'd' * 1000)
+        self.assertEqual(cache.evictions, 2)
+        cache.close()
+
+    def test_size_is_kept_up_to_date(self):
+        cache = HttpCache(self.path)
+        count = EVICTION_BATCH_SIZE * 2 + 10
+        for number in range(count):
+            cache.put(str(number), str(number) * 100)
+        cache.put('0', 'replaced')
+        sizes = [size for size, in cache._connection.execute('SELECT size FROM pages ORDER BY accessed_at, rowid')]
+        self.assertEqual(len(sizes), count)
+        self.assertEqual(cache.size(), sum(sizes))
+        # Keeping the 10 most recently used entries evicts more than two batches
+        self.assertEqual(cache.evict(sum(sizes[-10:])), count - 10)
+        self.assertEqual(len(cache), 10)
+        self.assertEqual(cache.size(), sum(sizes[-10:]))
+        self.assertIsNotNone(cache.get('0'))
+        cache.close()
+
+        cache = HttpCache(self.path)
+        self.assertEqual(cache.size(), cache._connection.execute('SELECT SUM(size) FROM pages').fetchone()[0])
+        cache.clear()
+        self.assertEqual(cache.size(), 0)
+        cache.close()
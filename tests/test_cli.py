@@ -0,0 +1,105 @@
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+
+from scraper.cli import main
+from tests.mock import expected_response
+from tests.server import FixtureServer
+
+
+class CliTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = Path(self._directory.name)
+        self.input = self.directory / 'words.txt'
+        self.output = self.directory / 'words.jsonl'
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _run(self, server, *args):
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            code = main(['en', 'en', str(self.input), '--output', str(self.output),
+                         '--base-url', server.base_url('en'), '--checkpoint-every', '1', '--retries', '0', *args])
+        return code, stderr.getvalue()
+
+    def _responses(self):
+        with open(self.output, encoding='utf-8') as output:
+            return {response['word']: response for response in map(json.loads, output)}
+
+    def test_scrapes_words(self):
+        self.input.write_text('complicated\n\nfoobar\nmissing\n', encoding='utf-8')
+        with FixtureServer() as server:
+            code, stderr = self._run(server, '--concurrency', '2')
+        self.assertEqual(code, 0)
+        responses = self._responses()
+        self.assertDictEqual(responses['complicated'], expected_response('en', 'en', 'complicated'))
+        self.assertDictEqual(responses['foobar'], expected_response('en', 'en', 'foobar'))
+        self.assertEqual(responses['missing']['error'], 'not_found')
+        self.assertIn('3 words', stderr)
+        self.assertIn('words/s, 1 not found, 0 errors', stderr)
+        journal = (self.directory / 'words.jsonl.checkpoint').read_text(encoding='utf-8').split()
+        self.assertCountEqual(journal, ['complicated', 'foobar', 'missing'])
+
+    def test_resumes_from_checkpoint(self):
+        self.input.write_text('complicated\nfoobar\n', encoding='utf-8')
+        self.output.write_text(json.dumps(expected_response('en', 'en', 'complicated')) + '\n', encoding='utf-8')
+        (self.directory / 'words.jsonl.checkpoint').write_text('complicated\n', encoding='utf-8')
+        with FixtureServer() as server:
+            code, _ = self._run(server)
+        self.assertEqual(code, 0)
+        self.assertEqual(server.requests, ['/en/wiki/foobar'])
+        self.assertEqual(list(self._responses()), ['complicated', 'foobar'])
+
+    def test_failed_words_are_retried_on_resume(self):
+        self.input.write_text('complicated\nfoobar\n', encoding='utf-8')
+        with FixtureServer() as server:
+            server.inject_fault('foobar', 503)
+            code, stderr = self._run(server, '--skip-errors', '--concurrency', '1')
+            self.assertEqual(code, 1)
+            self.assertIn('1 errors', stderr)
+            self.assertEqual(list(self._responses()), ['complicated'])
+            code, _ = self._run(server)
+        self.assertEqual(code, 0)
+        self.assertEqual(list(self._responses()), ['complicated', 'foobar'])
+        self.assertEqual(len(server.requests), 3)
+
+    def test_preflight(self):
+        self.input.write_text('gibi\nGibi\narabalar\nmissing\n', encoding='utf-8')
+        with FixtureServer() as server:
+            code, _ = self._run(server, '--preflight', '--concurrency', '3')
+        self.assertEqual(code, 0)
+        with open(self.output, encoding='utf-8') as output:
+            responses = {response.get('redirected_from', response['word']): response
+                         for response in map(json.loads, output)}
+        self.assertEqual(sorted(responses), ['Gibi', 'arabalar', 'gibi', 'missing'])
+        self.assertEqual(responses['Gibi']['word'], 'gibi')
+        self.assertNotIn('redirected_from', responses['gibi'])
+        self.assertEqual(responses['arabalar']['meanings'], expected_response('en', 'en', 'araba')['meanings'])
+        self.assertEqual(responses['missing']['error'], 'not_found')
+        # One query and each existing page once
+        self.assertEqual(len(server.requests), 3)
+
+    def test_failed_words_are_not_written(self):
+        self.input.write_text('complicated\nfoobar\n', encoding='utf-8')
+        with FixtureServer() as server:
+            server.inject_fault('foobar', 503)
+            code, stderr = self._run(server, '--concurrency', '1')
+            self.assertEqual(code, 1)
+            self.assertIn('foobar: ', stderr)
+            self.assertEqual(list(self._responses()), ['complicated'])
+            code, _ = self._run(server)
+        self.assertEqual(code, 0)
+        with open(self.output, encoding='utf-8') as output:
+            words = [json.loads(line)['word'] for line in output]
+        self.assertEqual(words, ['complicated', 'foobar'])
+        self.assertDictEqual(self._responses()['foobar'], expected_response('en', 'en', 'foobar'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import bz2
+import gzip
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from scraper import ingest_dump, read_dump, scrape_dump, scrape_html
+from scraper.dump import to_legacy_markup
+from tests.mock import fixture_html
+
+words = ['complicated', 'foobar', 'gibi', 'el', 'araba']
+
+
+def to_parsoid(html: str) -> str:
+    """
+    A saved page in the Parsoid markup of the dumps: every header carries its id and starts a section element
+    nested in the section of the header above it.
+    """
+    content = BeautifulSoup(html, 'html.parser').find(class_='mw-parser-output')
+    body = BeautifulSoup('<body></body>', 'html.parser')
+    sections = [(1, body.body)]
+    # Parsoid pages have no table of contents
+    content.find(id='toc').decompose()
+    for child in list(content.children):
+        headline = child.find(class_='mw-headline') if child.name in ['h2', 'h3', 'h4', 'h5', 'h6'] else None
+        if headline is not None:
+            level = int(child.name[1])
+            while sections[-1][0] >= level:
+                sections.pop()
+            section = body.new_tag('section')
+            header = body.new_tag(child.name, id=headline['id'])
+            header.string = headline.get_text()
+            section.append(header)
+            sections[-1][1].append(section)
+            sections.append((level, section))
+        else:
+            sections[-1][1].append(child.extract())
+    return str(body)
+
+
+def write_dump(path: Path, opener=open, parsoid=False) -> Path:
+    with opener(path, 'wt', encoding='utf-8') as dump:
+        for identifier, word in enumerate(words):
+            html = fixture_html('en', word)
+            article = {
+                'name': word,
+                'identifier': identifier,
+                'url': f'https://en.wiktionary.org/wiki/{word}',
+                'in_language': {'identifier': 'en'},
+                'article_body': {
+                    'html': to_parsoid(html) if parsoid else html,
+                    'wikitext': '',
+                },
+            }
+            dump.write(json.dumps(article) + '\n')
+    return path
+
+
+class DumpTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = Path(self._directory.name)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_read_compressed_dumps(self):
+        plain = write_dump(self.directory / 'enwiktionary.ndjson')
+        compressed = [
+            write_dump(self.directory / 'enwiktionary.ndjson.gz', gzip.open),
+            write_dump(self.directory / 'enwiktionary.ndjson.bz2', bz2.open),
+        ]
+        expected = list(read_dump(plain))
+        self.assertEqual([title for title, _ in expected], words)
+        for path in compressed:
+            self.assertEqual(list(read_dump(path)), expected)
+
+    def test_scrape_dump(self):
+        path = write_dump(self.directory / 'enwiktionary.ndjson.gz', gzip.open)
+        responses = list(scrape_dump('tr', 'en', path))
+        self.assertEqual([response['word'] for response in responses], ['gibi', 'el', 'araba'])
+        for response in responses:
+            html = fixture_html('en', response['word'])
+            self.assertDictEqual(response, scrape_html('tr', 'en', response['word'], html))
+        self.assertEqual(list(scrape_dump('tr', 'en', path, workers=2, chunk_size=1)), responses)
+
+    def test_scrape_parsoid_dump(self):
+        html = to_parsoid(fixture_html('en', 'gibi'))
+        self.assertIn('<section><h2 id="Turkish">Turkish</h2>\n<section><h3 id="Etymology">', html)
+        self.assertNotIn('mw-headline', html)
+        self.assertEqual(to_legacy_markup(fixture_html('en', 'gibi')), fixture_html('en', 'gibi'))
+        path = write_dump(self.directory / 'enwiktionary.ndjson', parsoid=True)
+        responses = list(scrape_dump('tr', 'en', path))
+        self.assertEqual([response['word'] for response in responses], ['gibi', 'el', 'araba'])
+        for response in responses:
+            self.assertTrue(response['meanings'])
+            html = fixture_html('en', response['word'])
+            self.assertDictEqual(response, scrape_html('tr', 'en', response['word'], html))
+
+    def test_ingest_dump(self):
+        path = write_dump(self.directory / 'enwiktionary.ndjson.bz2', bz2.open)
+        output = io.StringIO()
+        self.assertEqual(ingest_dump('en', 'en', path, output), 4)
+        lines = output.getvalue().splitlines()
+        self.assertEqual([json.loads(line)['word'] for line in lines], ['complicated', 'foobar', 'el', 'araba'])
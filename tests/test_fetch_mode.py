@@ -0,0 +1,50 @@
+import unittest
+from unittest.mock import patch
+
+from scraper import PageNotFoundError, Scraper, Transport
+from tests.mock import fixture_cases, mock_get_html
+from tests.server import FixtureServer
+
+
+class FetchModeTestCase(unittest.TestCase):
+
+    def test_parse_mode_matches_page_mode(self):
+        with FixtureServer() as server, Transport() as transport:
+            for from_language, to_language, word in fixture_cases:
+                with self.subTest(from_language=from_language, to_language=to_language, word=word):
+                    section_scraper = Scraper(from_language, to_language, transport=transport,
+                                              base_url=server.base_url(to_language), fetch_mode='parse')
+                    with patch('scraper.scraper.get_html', side_effect=mock_get_html):
+                        expected = Scraper(from_language, to_language).scrape(word)
+                    self.assertDictEqual(section_scraper.scrape(word), expected)
+
+    def test_parse_mode_fetches_less(self):
+        with FixtureServer() as server, Transport() as transport:
+            page_html = Scraper('tr', 'en', transport=transport, base_url=server.base_url('en')).fetch_html('gibi')
+            section_scraper = Scraper('tr', 'en', transport=transport, base_url=server.base_url('en'),
+                                      fetch_mode='parse')
+            section_html = section_scraper.fetch_html('gibi')
+        self.assertIn('id="Turkish"', section_html)
+        self.assertNotIn('mw-editsection', section_html)
+        self.assertLess(len(section_html), len(page_html))
+
+    def test_missing_section(self):
+        with FixtureServer() as server:
+            section_scraper = Scraper('es', 'en', base_url=server.base_url('en'), fetch_mode='parse')
+            self.assertEqual(section_scraper.fetch_html('gibi'), '')
+            self.assertEqual(section_scraper.scrape('gibi')['meanings'], [])
+        self.assertEqual(len(server.requests), 2)
+
+    def test_missing_page(self):
+        with FixtureServer() as server:
+            section_scraper = Scraper('en', 'en', base_url=server.base_url('en'), fetch_mode='parse')
+            with self.assertRaises(PageNotFoundError):
+                section_scraper.scrape('missing')
+
+    def test_unsupported_fetch_mode(self):
+        with self.assertRaises(ValueError):
+            Scraper('en', 'en', fetch_mode='rest')
+
+
+if __name__ == '__main__':
+    unittest.main()
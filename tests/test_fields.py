@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import patch
+
+from scraper import Scraper, scrape
+from scraper.scraper import FIELDS
+from tests.mock import fixture_cases, mock_get_html
+
+PROFILES = [
+    {'definitions', 'part_of_speech'},
+    {'definitions', 'examples'},
+    {'pronunciation'},
+    {'synonyms', 'derived_terms', 'etymology'},
+    {'metadata', 'related_terms'},
+]
+
+
+def project(response, fields):
+    """
+    The parts of a full response which extraction of only the given fields keeps.
+    """
+    projected = {key: response[key] for key in ['word', 'from_language', 'to_language']}
+    projected['meanings'] = []
+    for meaning in response['meanings']:
+        projected_meaning = {'etymology': meaning['etymology'] if 'etymology' in fields else None, 'definitions': []}
+        if 'definitions' in fields:
+            projected_meaning['definitions'] = [{
+                'text': definition['text'],
+                'examples': definition['examples'] if 'examples' in fields else [],
+            } for definition in meaning['definitions']]
+        for key, value in meaning.items():
+            if key in fields and key not in ['etymology', 'definitions']:
+                projected_meaning[key] = value
+        projected['meanings'].append(projected_meaning)
+    if 'pronunciation' in fields:
+        projected['pronunciation'] = response['pronunciation']
+    return projected
+
+
+class FieldsTestCase(unittest.TestCase):
+
+    @patch('scraper.scraper.get_html', side_effect=mock_get_html)
+    def test_selected_fields_match_full_extraction(self, _):
+        for from_language, to_language, word in fixture_cases:
+            full = Scraper(from_language, to_language).scrape(word)
+            for fields in PROFILES:
+                with self.subTest(from_language=from_language, to_language=to_language, word=word, fields=fields):
+                    response = Scraper(from_language, to_language, fields=fields).scrape(word)
+                    self.assertDictEqual(response, project(full, fields))
+
+    @patch('scraper.scraper.get_html', side_effect=mock_get_html)
+    def test_all_fields(self, _):
+        self.assertDictEqual(Scraper('en', 'en', fields=FIELDS).scrape('complicated'),
+                             Scraper('en', 'en').scrape('complicated'))
+
+    @patch('scraper.scraper.get_html', side_effect=mock_get_html)
+    def test_scrape_with_fields(self, _):
+        response = scrape('en', 'en', 'complicated', fields=['definitions'])
+        self.assertNotIn('pronunciation', response)
+        self.assertNotIn('part_of_speech', response['meanings'][0])
+        self.assertTrue(response['meanings'][0]['definitions'])
+
+    def test_unsupported_field(self):
+        with self.assertRaises(ValueError):
+            Scraper('en', 'en', fields=['definitions', 'colour'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from scraper import Hook, Instrumentation, MetricsAggregator, Scraper, Transport, scrape_many
+from tests.mock import mock_get_html
+from tests.server import FixtureServer
+
+
+class RecordingHook(Hook):
+
+    def __init__(self):
+        self.timings = []
+        self.counts = []
+
+    def on_timing(self, stage, seconds):
+        self.timings.append(stage)
+
+    def on_count(self, counter, value):
+        self.counts.append((counter, value))
+
+
+class InstrumentationTestCase(unittest.TestCase):
+
+    @patch('scraper.scraper.get_html', side_effect=mock_get_html)
+    def test_scraper_stages_and_counters(self, _):
+        metrics = MetricsAggregator()
+        word_scraper = Scraper('en', 'en', instrumentation=Instrumentation([metrics]))
+        response = word_scraper.scrape('complicated')
+        snapshot = metrics.snapshot()
+        for stage in ['prune', 'parse', 'section_walk', 'process_header', 'process_meaning_values']:
+            self.assertIn(stage, snapshot['timings'])
+            self.assertGreater(snapshot['timings'][stage]['count'], 0)
+        self.assertGreater(snapshot['counters']['nodes_parsed'], 0)
+        self.assertEqual(snapshot['counters']['definitions_found'],
+                         sum(len(meaning['definitions']) for meaning in response['meanings']))
+
+    @patch('scraper.scraper.get_html', side_effect=mock_get_html)
+    def test_instrumentation_does_not_change_responses(self, _):
+        instrumented = Scraper('en', 'en', instrumentation=Instrumentation([MetricsAggregator()]))
+        self.assertDictEqual(instrumented.scrape('complicated'), Scraper('en', 'en').scrape('complicated'))
+
+    def test_transport_stages(self):
+        hook = RecordingHook()
+        instrumentation = Instrumentation([hook])
+        with FixtureServer() as server, Transport(instrumentation=instrumentation) as transport:
+            html = transport.get_html(f'{server.base_url("en")}/wiki/complicated')
+        self.assertEqual(hook.timings[0], 'fetch')
+        self.assertEqual(set(hook.timings[1:]), {'decode'})
+        self.assertEqual({counter for counter, _ in hook.counts}, {'bytes_fetched'})
+        self.assertEqual(sum(value for _, value in hook.counts), len(html.encode('utf-8')))
+
+    def test_scrape_many_instrumentation(self):
+        metrics = MetricsAggregator()
+        with FixtureServer() as server:
+            list(scrape_many('en', 'en', ['complicated', 'foobar'], base_url=server.base_url('en'),
+                             instrumentation=Instrumentation([metrics])))
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['timings']['fetch']['count'], 2)
+        self.assertEqual(snapshot['timings']['parse']['count'], 2)
+        self.assertGreater(snapshot['counters']['bytes_fetched'], 0)
+
+    def test_disabled_by_default(self):
+        instrumentation = Instrumentation()
+        self.assertFalse(instrumentation.enabled)
+        with instrumentation.timed('parse'):
+            pass
+        instrumentation.count('nodes_parsed')
+
+    def test_exports(self):
+        metrics = MetricsAggregator()
+        metrics.on_timing('parse', 0.5)
+        metrics.on_timing('parse', 0.25)
+        metrics.on_count('definitions_found', 3)
+        self.assertDictEqual(json.loads(metrics.to_json()), {
+            'timings': {'parse': {'count': 2, 'sum': 0.75, 'min': 0.25, 'max': 0.5}},
+            'counters': {'definitions_found': 3},
+        })
+        prometheus = metrics.to_prometheus()
+        self.assertIn('wkt_scraper_stage_seconds_sum{stage="parse"} 0.75', prometheus)
+        self.assertIn('wkt_scraper_stage_seconds_count{stage="parse"} 2', prometheus)
+        self.assertIn('wkt_scraper_definitions_found_total 3', prometheus)
+        metrics.reset()
+        self.assertDictEqual(metrics.snapshot(), {'timings': {}, 'counters': {}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+from unittest.mock import patch
+
+from scraper import scrape_html
+from scraper.scraper import slice_language_section
+from tests.mock import fixture_cases, fixture_html
+
+
+class LanguageSectionTestCase(unittest.TestCase):
+
+    def test_slice_language_section(self):
+        html = fixture_html('en', 'araba')
+        section = slice_language_section(html, 'Swedish')
+        self.assertTrue(section.startswith('<h2><span class="mw-headline" id="Swedish">'))
+        self.assertEqual(section.count('<h2'), 1)
+        self.assertNotIn('id="Tswana"', section)
+        self.assertNotIn('id="Spanish"', section)
+
+    def test_slice_last_language_section(self):
+        html = fixture_html('en', 'foobar')
+        section = slice_language_section(html, 'English')
+        self.assertTrue(section.startswith('<h2><span class="mw-headline" id="English">'))
+        self.assertIn('id="References"', section)
+        self.assertNotIn('NewPP limit report', section)
+        self.assertNotIn('Navigation menu', section)
+
+    def test_missing_language_section(self):
+        html = fixture_html('en', 'foobar')
+        self.assertIsNone(slice_language_section(html, 'Turkish'))
+
+    def test_sliced_and_full_page_responses_are_identical(self):
+        for from_language, to_language, word in fixture_cases:
+            html = fixture_html(to_language, word)
+            with self.subTest(from_language=from_language, to_language=to_language, word=word):
+                with patch('scraper.scraper.slice_language_section', return_value=None):
+                    expected = scrape_html(from_language, to_language, word, html)
+                self.assertDictEqual(scrape_html(from_language, to_language, word, html), expected)
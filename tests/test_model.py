@@ -0,0 +1,37 @@
+import pickle
+import unittest
+from unittest.mock import patch
+
+from scraper import Scraper
+from scraper.model import Definition, Example, Meaning, WordResult
+from tests.mock import fixture_cases, mock_get_html
+
+
+class ModelTestCase(unittest.TestCase):
+
+    @patch('scraper.scraper.get_html', side_effect=mock_get_html)
+    def test_to_dict_matches_responses(self, _):
+        for from_language, to_language, word in fixture_cases:
+            with self.subTest(from_language=from_language, to_language=to_language, word=word):
+                result = Scraper(from_language, to_language, typed=True).scrape(word)
+                self.assertIsInstance(result, WordResult)
+                self.assertDictEqual(result.to_dict(), Scraper(from_language, to_language).scrape(word))
+
+    @patch('scraper.scraper.get_html', side_effect=mock_get_html)
+    def test_records_are_slotted(self, _):
+        result = Scraper('en', 'en', typed=True).scrape('complicated')
+        self.assertFalse(hasattr(result, '__dict__'))
+        self.assertFalse(hasattr(result.meanings[0], '__dict__'))
+        self.assertEqual(pickle.loads(pickle.dumps(result)), result)
+
+    def test_meaning_leaves_out_missing_fields(self):
+        meaning = Meaning(definitions=[Definition('text', [Example('example')])], synonyms=['word'])
+        self.assertDictEqual(meaning.to_dict(), {
+            'etymology': None,
+            'definitions': [{'text': 'text', 'examples': [{'example': 'example', 'translation': None}]}],
+            'synonyms': ['word'],
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
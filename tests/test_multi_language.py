@@ -0,0 +1,36 @@
+import unittest
+from unittest.mock import patch
+
+from scraper import MultiLanguageScraper, Scraper, Transport, scrape_languages
+from tests.mock import expected_response, mock_get_html
+from tests.server import FixtureServer
+
+
+class MultiLanguageTestCase(unittest.TestCase):
+
+    def test_scrapes_every_language_with_one_fetch(self):
+        with FixtureServer() as server:
+            results = scrape_languages('en', 'araba', base_url=server.base_url('en'))
+        self.assertEqual(sorted(results), ['en', 'es', 'tr'])
+        for from_language, result in results.items():
+            self.assertDictEqual(result, expected_response(from_language, 'en', 'araba'))
+        self.assertEqual(len(server.requests), 1)
+
+    def test_leaves_out_languages_without_section(self):
+        with FixtureServer() as server, Transport() as transport:
+            multi_scraper = MultiLanguageScraper('en', transport=transport, base_url=server.base_url('en'))
+            self.assertEqual(list(multi_scraper.scrape('gibi')), ['tr'])
+            results = scrape_languages('en', 'gibi', ['tr', 'es'], transport=transport,
+                                       base_url=server.base_url('en'))
+        self.assertDictEqual(results['tr'], expected_response('tr', 'en', 'gibi'))
+        self.assertDictEqual(results['es'], expected_response('es', 'en', 'gibi'))
+
+    @patch('scraper.scraper.get_html', side_effect=mock_get_html)
+    def test_scraper_options(self, _):
+        results = MultiLanguageScraper('en', ['en', 'tr'], typed=True, fields={'definitions'}).scrape('el')
+        self.assertEqual(results['tr'].to_dict(), Scraper('tr', 'en', fields={'definitions'}).scrape('el'))
+        self.assertEqual(results['en'].to_dict(), Scraper('en', 'en', fields={'definitions'}).scrape('el'))
+
+
+if __name__ == '__main__':
+    unittest.main()
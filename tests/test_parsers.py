@@ -0,0 +1,26 @@
+import unittest
+from importlib.util import find_spec
+
+from scraper import scrape_html
+from scraper.scraper import PARSERS, get_default_parser, parse_html
+from tests.mock import fixture_cases, fixture_html
+
+
+class ParserTestCase(unittest.TestCase):
+
+    def test_default_parser(self):
+        expected = 'lxml' if find_spec('lxml') else 'html.parser'
+        self.assertEqual(get_default_parser(), expected)
+
+    def test_unsupported_parser(self):
+        with self.assertRaises(ValueError):
+            parse_html('<html></html>', 'foo')
+
+    @unittest.skipUnless(find_spec('lxml'), 'lxml is not installed')
+    def test_parsers_give_identical_responses(self):
+        for from_language, to_language, word in fixture_cases:
+            html = fixture_html(to_language, word)
+            expected = scrape_html(from_language, to_language, word, html, parser='html.parser')
+            for parser in PARSERS:
+                with self.subTest(parser=parser, from_language=from_language, to_language=to_language, word=word):
+                    self.assertDictEqual(scrape_html(from_language, to_language, word, html, parser=parser), expected)
@@ -0,0 +1,33 @@
+import unittest
+
+from scraper import ParserPool, parse_many, scrape_html
+from tests.mock import fixture_html
+
+
+def fixture_page(to_language: str, word: str):
+    return word, fixture_html(to_language, word)
+
+
+class PipelineTestCase(unittest.TestCase):
+
+    def test_parse_many_keeps_input_order(self):
+        pages = [fixture_page('en', word) for word in ['complicated', 'foobar', 'complicated', 'foobar', 'foobar']]
+        responses = list(parse_many('en', 'en', pages, workers=2, chunk_size=2))
+        self.assertEqual([response['word'] for response in responses],
+                         ['complicated', 'foobar', 'complicated', 'foobar', 'foobar'])
+        for (word, html), response in zip(pages, responses):
+            self.assertDictEqual(response, scrape_html('en', 'en', word, html))
+
+    def test_pool_consumes_pages_lazily(self):
+        consumed = []
+
+        def pages():
+            for word in ['araba', 'car', 'street'] * 4:
+                consumed.append(word)
+                yield fixture_page('tr', word)
+
+        with ParserPool('tr', 'tr', workers=1, chunk_size=1, max_pending_chunks=2) as pool:
+            responses = pool.map(pages())
+            self.assertEqual(next(responses)['word'], 'araba')
+            self.assertLessEqual(len(consumed), 3)
+            self.assertEqual(len(list(responses)), 11)
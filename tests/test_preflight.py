@@ -0,0 +1,74 @@
+import unittest
+
+from scraper import Scraper, Transport, scrape_many
+from scraper.scraper import QUERY_BATCH_SIZE, mark_redirect_targets, resolve_titles
+from tests.mock import expected_response
+from tests.server import FixtureServer
+
+
+class PreflightTestCase(unittest.TestCase):
+
+    def test_resolve_titles(self):
+        with FixtureServer() as server:
+            resolved = resolve_titles(['gibi', 'Gibi', 'arabalar', 'missing', 'foo_bar'], server.base_url('en'))
+        self.assertDictEqual(resolved, {
+            'gibi': 'gibi',
+            'Gibi': 'gibi',
+            'arabalar': 'araba',
+            'missing': None,
+            'foo_bar': None,
+        })
+        self.assertEqual(len(server.requests), 1)
+
+    def test_resolves_in_batches(self):
+        words = [f'missing{number}' for number in range(QUERY_BATCH_SIZE * 2 + 1)] + ['gibi', 'invalid|title']
+        with FixtureServer() as server:
+            word_scraper = Scraper('tr', 'en', base_url=server.base_url('en'))
+            resolved = list(word_scraper.resolve_titles(words))
+        self.assertEqual([word for word, _ in resolved], words)
+        self.assertEqual(resolved[-2], ('gibi', 'gibi'))
+        self.assertEqual(resolved[-1], ('invalid|title', None))
+        self.assertEqual(len(server.requests), 3)
+
+    def test_mark_redirect_targets(self):
+        titles = [('gibi', 'gibi'), ('araba', 'araba'), ('Gibi', 'gibi'), ('missing', None)]
+        titles += [(f'word{number}', f'word{number}') for number in range(QUERY_BATCH_SIZE)] + [('arabalar', 'araba')]
+        marked = list(mark_redirect_targets(titles))
+        self.assertEqual(marked[:4], [('gibi', 'gibi', True), ('araba', 'araba', False), ('Gibi', 'gibi', True),
+                                      ('missing', None, False)])
+        # The redirect to araba is only seen in the next batch
+        self.assertEqual(marked[-1], ('arabalar', 'araba', True))
+        self.assertEqual(sum(is_target for _, _, is_target in marked), 3)
+
+    def test_mark_redirect_targets_forgets_old_batches(self):
+        filler = [(f'word{number}', f'word{number}') for number in range(QUERY_BATCH_SIZE)]
+        titles = [('arabalar', 'araba')] + filler + filler + [('araba', 'araba')]
+        marked = list(mark_redirect_targets(titles))
+        self.assertEqual(marked[0], ('arabalar', 'araba', True))
+        # The redirect is two batches back, so the page is fetched again
+        self.assertEqual(marked[-1], ('araba', 'araba', False))
+
+    def test_scrape_many_with_preflight(self):
+        words = ['gibi', 'missing', 'Gibi', 'arabalar', 'araba']
+        with FixtureServer() as server, Transport() as transport:
+            responses = list(scrape_many('tr', 'en', words, transport=transport, base_url=server.base_url('en'),
+                                         preflight=True))
+        self.assertEqual(len(responses), 4)
+        self.assertDictEqual(responses[0], expected_response('tr', 'en', 'gibi'))
+        self.assertDictEqual(responses[1], {**expected_response('tr', 'en', 'gibi'), 'redirected_from': 'Gibi'})
+        self.assertDictEqual(responses[2], {**expected_response('tr', 'en', 'araba'), 'redirected_from': 'arabalar'})
+        self.assertDictEqual(responses[3], expected_response('tr', 'en', 'araba'))
+        # One query and each existing page once
+        self.assertEqual(len(server.requests), 3)
+
+    def test_scrape_many_preflight_errors(self):
+        with FixtureServer() as server:
+            responses = list(scrape_many('tr', 'en', ['missing', 'gibi'], base_url=server.base_url('en'),
+                                         preflight=True, return_errors=True))
+        self.assertEqual(responses[0]['error'], 'not_found')
+        self.assertNotIn('error', responses[1])
+        self.assertEqual(len(server.requests), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from scraper import ResultCache, scrape
+from tests.mock import mock_get_html
+
+
+class ResultCacheTestCase(unittest.TestCase):
+
+    @patch('scraper.scraper.get_html', side_effect=mock_get_html)
+    def test_scrape_with_result_cache(self, get_html):
+        result_cache = ResultCache()
+        first = scrape('en', 'en', 'foobar', result_cache=result_cache)
+        first['meanings'].clear()
+        second = scrape('en', 'en', 'foobar', result_cache=result_cache)
+        scrape('tr', 'en', 'foobar', result_cache=result_cache)
+        self.assertEqual(get_html.call_count, 2)
+        self.assertEqual(len(second['meanings']), 1)
+        self.assertEqual((result_cache.hits, result_cache.misses), (1, 2))
+
+    def test_lru_eviction_by_entries(self):
+        result_cache = ResultCache(max_entries=2)
+        result_cache.get_or_compute('a', lambda: {'word': 'a'})
+        result_cache.get_or_compute('b', lambda: {'word': 'b'})
+        result_cache.get_or_compute('a', lambda: {'word': 'a'})
+        result_cache.get_or_compute('c', lambda: {'word': 'c'})
+        self.assertEqual(len(result_cache), 2)
+        self.assertEqual(result_cache.get_or_compute('b', lambda: {'word': 'b2'}), {'word': 'b2'})
+        self.assertEqual(result_cache.get_or_compute('c', lambda: {'word': 'c2'}), {'word': 'c'})
+
+    def test_lru_eviction_by_size(self):
+        result_cache = ResultCache(max_bytes=2000)
+        for word in ['a', 'b', 'c', 'd']:
+            result_cache.get_or_compute(word, lambda: {'meanings': ['x' * 500]})
+        self.assertLessEqual(result_cache.size, 2000)
+        self.assertEqual(len(result_cache), 2)
+        result_cache.get_or_compute('e', lambda: {'meanings': ['x' * 5000]})
+        self.assertEqual(len(result_cache), 2)
+
+    def test_single_flight(self):
+        result_cache = ResultCache()
+        calls = []
+        results = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return {'word': 'run'}
+
+        threads = [threading.Thread(target=lambda: results.append(result_cache.get_or_compute('run', compute)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'word': 'run'}] * 8)
+
+    def test_errors_are_not_cached(self):
+        result_cache = ResultCache()
+
+        def missing():
+            raise FileNotFoundError('missing')
+
+        with self.assertRaises(FileNotFoundError):
+            result_cache.get_or_compute('missing', missing)
+        self.assertEqual(result_cache.get_or_compute('missing', lambda: {'word': 'missing'}), {'word': 'missing'})
@@ -0,0 +1,35 @@
+import unittest
+
+from scraper import Transport, scrape_many
+from tests.mock import expected_response
+from tests.server import FixtureServer
+
+
+class ScrapeManyTestCase(unittest.TestCase):
+
+    def test_scrape_many_reuses_connection(self):
+        words = ['complicated', 'foobar', 'gibi', 'complicated']
+        with FixtureServer() as server:
+            responses = list(scrape_many('en', 'en', words[:2], base_url=server.base_url('en')))
+            responses += list(scrape_many('tr', 'en', words[2:3], base_url=server.base_url('en')))
+            responses += list(scrape_many('en', 'en', words[3:], base_url=server.base_url('en')))
+        self.assertEqual(len(responses), 4)
+        self.assertDictEqual(responses[0], expected_response('en', 'en', 'complicated'))
+        self.assertDictEqual(responses[1], expected_response('en', 'en', 'foobar'))
+        self.assertDictEqual(responses[2], expected_response('tr', 'en', 'gibi'))
+        self.assertEqual(len(server.requests), 4)
+        # Each call opens its own transport, whose words share one connection
+        self.assertEqual(len(server.connections), 3)
+
+    def test_shared_transport_keeps_connection_alive(self):
+        with FixtureServer() as server, Transport(pool_size=2, timeout=5) as transport:
+            list(scrape_many('en', 'en', ['complicated', 'foobar'], transport=transport,
+                             base_url=server.base_url('en')))
+            list(scrape_many('es', 'en', ['aprender'], transport=transport, base_url=server.base_url('en')))
+        self.assertEqual(len(server.requests), 3)
+        self.assertEqual(len(server.connections), 1)
+
+    def test_missing_word(self):
+        with FixtureServer() as server:
+            with self.assertRaises(FileNotFoundError):
+                list(scrape_many('en', 'en', ['missing'], base_url=server.base_url('en')))
@@ -0,0 +1,93 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from scraper import Scraper, scrape_html
+from scraper.language import get_language, language_names
+from scraper.scraper import SectionIndex, parse_html
+from tests.mock import fixture_cases, fixture_html, mock_get_html
+
+
+class ScraperTestCase(unittest.TestCase):
+
+    @patch('scraper.scraper.get_html', side_effect=mock_get_html)
+    def test_scraper_is_reusable(self, _):
+        tr_en = Scraper('tr', 'en')
+        words = ['gibi', 'araba', 'el', 'foobar']
+        expected = [scrape_html('tr', 'en', word,
+                                fixture_html('en', word))
+                    for word in words]
+        self.assertEqual([tr_en.scrape(word) for word in words], expected)
+        self.assertEqual([tr_en.scrape(word) for word in words], expected)
+
+    @patch('scraper.scraper.get_html', side_effect=mock_get_html)
+    def test_scraper_is_thread_safe(self, _):
+        en_en = Scraper('en', 'en')
+        words = ['complicated', 'foobar', 'el', 'araba'] * 8
+        expected = {word: en_en.scrape(word) for word in set(words)}
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(en_en.scrape, words))
+        self.assertEqual(responses, [expected[word] for word in words])
+
+    def test_extraction_leaves_tree_untouched(self):
+        for _, to_language, word in fixture_cases:
+            html = fixture_html(to_language, word)
+            root = parse_html(html)
+            markup = str(root)
+            for from_language in language_names[to_language]:
+                with self.subTest(from_language=from_language, to_language=to_language, word=word):
+                    word_scraper = Scraper(from_language, to_language)
+                    expected = word_scraper.scrape_html(word, html)
+                    self.assertDictEqual(word_scraper.scrape_root(word, root), expected)
+                    self.assertDictEqual(word_scraper.scrape_root(word, root), expected)
+            self.assertEqual(str(root), markup)
+
+    def test_shared_tree_across_threads(self):
+        html = fixture_html('en', 'araba')
+        root = parse_html(html)
+        scrapers = [Scraper(from_language, 'en') for from_language in ['en', 'es', 'tr']] * 8
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(lambda word_scraper: word_scraper.scrape_root('araba', root), scrapers))
+        self.assertEqual(responses, [word_scraper.scrape_html('araba', html) for word_scraper in scrapers])
+
+    def test_full_page_stops_at_next_language(self):
+        html = '''
+            <h2><span class="mw-headline" id="English">English</span></h2>
+            <h3><span class="mw-headline" id="Noun">Noun</span></h3>
+            <ol><li>A definition.</li></ol>
+            <h2><span class="mw-headline" id="Spanish">Spanish</span></h2>
+            <h3><span class="mw-headline" id="Synonyms">Synonyms</span></h3>
+            <ul><li>sinonimo</li></ul>
+        '''
+        word_scraper = Scraper('en', 'en')
+        expected = word_scraper.scrape_html('word', html)
+        self.assertNotIn('synonyms', expected['meanings'][0])
+        self.assertDictEqual(word_scraper.scrape_root('word', parse_html(html)), expected)
+
+
+class SectionIndexTestCase(unittest.TestCase):
+
+    def test_kinds(self):
+        html = '''
+            <h2><span class="mw-headline" id="English">English</span></h2>
+            <h3><span class="mw-headline" id="Pronunciation">Pronunciation</span></h3>
+            <ul><li>IPA</li></ul>
+            <h3><span class="mw-headline" id="Etymology_1">Etymology 1</span></h3>
+            <p>From foo.</p>
+            <h4><span class="mw-headline" id="Noun">Noun</span></h4>
+            <p>word</p>
+            <table></table>
+            <ol><li>A definition.</li></ol>
+            <h5><span class="mw-headline" id="Synonyms_2">Synonyms</span></h5>
+            <ul><li>term</li></ul>
+        '''
+        root = parse_html(html)
+        index = SectionIndex(root.find('h2'), get_language('en').header_classifier)
+        self.assertEqual([node.name for node in index.nodes],
+                         ['h2', 'h3', 'ul', 'h3', 'p', 'h4', 'p', 'table', 'ol', 'h5', 'ul'])
+        self.assertEqual(index.is_pronunciation, [i == 1 for i in range(11)])
+        self.assertEqual(index.is_etymology, [i == 3 for i in range(11)])
+        self.assertEqual(index.is_part_of_speech, [i in [5, 6, 7] for i in range(11)])
+        self.assertEqual(index.next_list, [8] * 9 + [None] * 2)
+        self.assertEqual(index.additional_data[9], ('synonyms',))
+        self.assertEqual(sum(index.additional_data, ()), ('synonyms',))
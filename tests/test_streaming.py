@@ -0,0 +1,56 @@
+import unittest
+
+from scraper import Transport
+from scraper.language import language_names
+from scraper.scraper import SectionSlicer, get_html, slice_language_section
+from tests.mock import fixture_cases, fixture_html
+from tests.server import FixtureServer
+
+
+def fixture_pages():
+    for _, to_language, word in fixture_cases:
+        yield to_language, word, fixture_html(to_language, word)
+
+
+class StreamingTestCase(unittest.TestCase):
+
+    def test_slicer_matches_slice_language_section(self):
+        for to_language, word, html in fixture_pages():
+            for language_name in language_names[to_language].values():
+                expected = slice_language_section(html, language_name)
+                for chunk_size in [1, 5, 1000, 64 * 1024]:
+                    with self.subTest(word=word, language=language_name, chunk_size=chunk_size):
+                        slicer = SectionSlicer(language_name)
+                        for start in range(0, len(html), chunk_size):
+                            slicer.feed(html[start:start + chunk_size])
+                        self.assertEqual(slicer.close(), expected)
+
+    def test_slicer_stops_at_next_section(self):
+        slicer = SectionSlicer('English')
+        self.assertFalse(slicer.feed('<h1>Page</h1><h2><span id="Eng'))
+        self.assertFalse(slicer.feed('lish">English</span></h2><p>word</p>'))
+        self.assertTrue(slicer.feed('<h2><span id="Turkish">Turkish</span></h2>'))
+        self.assertEqual(slicer.close(), '<h2><span id="English">English</span></h2><p>word</p>')
+
+    def test_iter_html_decodes_split_characters(self):
+        html = fixture_html('en', 'gibi')
+        with FixtureServer() as server, Transport() as transport:
+            chunks = list(transport.iter_html(f'{server.base_url("en")}/wiki/gibi', chunk_size=3))
+        self.assertEqual(''.join(chunks), html)
+
+    def test_compressed_transfer(self):
+        html = fixture_html('en', 'complicated')
+        with FixtureServer(compress=True) as server, Transport() as transport:
+            self.assertEqual(transport.get_html(f'{server.base_url("en")}/wiki/complicated'), html)
+
+    def test_get_html_keeps_only_section(self):
+        html = fixture_html('en', 'gibi')
+        with FixtureServer(compress=True) as server, Transport() as transport:
+            url = f'{server.base_url("en")}/wiki/gibi'
+            self.assertEqual(get_html(url, transport, 'Turkish'), slice_language_section(html, 'Turkish'))
+            self.assertEqual(get_html(url, transport, 'Spanish'), '')
+        self.assertEqual(len(server.connections), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+from scraper import Transport, Translation, iter_translations, scrape_translations
+from scraper.translations import TranslationTableSlicer, parse_translation_table
+from tests.mock import fixture_html
+from tests.server import FixtureServer
+
+
+class TranslationsTestCase(unittest.TestCase):
+
+    def test_rows(self):
+        self.assertEqual(list(iter_translations([fixture_html('en', 'foobar')])), [
+            Translation('Esperanto', 'eo', 'ajn', 'variable name', 'noun'),
+            Translation('Japanese', 'ja', 'hogehoge', 'variable name', 'noun'),
+        ])
+
+    def test_annotations(self):
+        rows = list(iter_translations([fixture_html('en', 'complicated')]))
+        self.assertEqual(len(rows), 88)
+        self.assertIn(Translation('Arabic: South Levantine Arabic', 'ajp', 'عويص', 'difficult or convoluted',
+                                  'adjective', transliteration='ʕawīṣ'), rows)
+        self.assertIn(Translation('Hebrew', 'he', 'מסובכת', 'difficult or convoluted', 'adjective',
+                                  transliteration='mesubekhet', gender='f'), rows)
+        self.assertIn(Translation('Japanese', 'ja', '複雑', 'difficult or convoluted', 'adjective',
+                                  transliteration='ふくざつ, fukuzatsu'), rows)
+        self.assertEqual([row.language for row in rows if row.language_code == 'sh'],
+                         ['Serbo-Croatian: Cyrillic', 'Serbo-Croatian: Roman'])
+
+        greek = [row for row in iter_translations([fixture_html('en', 'araba')]) if row.language == 'Greek']
+        self.assertEqual([row.gender for row in greek], ['m sg', 'm pl'])
+
+    def test_translations_to_be_checked_and_qualifiers(self):
+        rows = list(iter_translations([fixture_html('en', 'el')]))
+        self.assertIn(Translation('Italian', 'it', 'elle', 'name of the letter L, l', 'noun', gender='m or f'), rows)
+        # The Mandarin line only has a qualifier saying that there is no translation
+        self.assertNotIn('Chinese: Mandarin', [row.language for row in rows])
+
+        table = ('<table class="translations" data-gloss="sense"><tr><td><ul><li>French: '
+                 '<span class="ib-content qualifier-content">informal</span> <span lang="fr">mot</span>, '
+                 '<span lang="fr">terme</span> <span class="ib-content qualifier-content">rare</span> '
+                 '<span class="mention-gloss">word</span></li></ul></td></tr></table>')
+        self.assertEqual(list(parse_translation_table(table, 'noun')), [
+            Translation('French', 'fr', 'mot', 'sense', 'noun', qualifier='informal'),
+            Translation('French', 'fr', 'terme', 'sense', 'noun', qualifier='rare', gloss='word'),
+        ])
+
+    def test_pages_without_translations(self):
+        for word in ['aprender', 'gibi']:
+            with self.subTest(word=word):
+                self.assertEqual(list(iter_translations([fixture_html('en', word)])), [])
+
+    def test_chunked_page(self):
+        for word in ['araba', 'complicated', 'el', 'foobar']:
+            html = fixture_html('en', word)
+            expected = list(iter_translations([html]))
+            for chunk_size in [1, 7, 1000]:
+                with self.subTest(word=word, chunk_size=chunk_size):
+                    chunks = (html[start:start + chunk_size] for start in range(0, len(html), chunk_size))
+                    self.assertEqual(list(iter_translations(chunks)), expected)
+
+    def test_slicer_returns_tables_as_they_complete(self):
+        slicer = TranslationTableSlicer()
+        self.assertEqual(slicer.feed('<h3 id="Verb">Verb</h3><h4 id="Translations">Translations</h4><table cl'), [])
+        self.assertEqual(slicer.feed('ass="translations" data-gloss="a"><tr><td></td></tr></table><h3 id="N'), [
+            ('verb', '<table class="translations" data-gloss="a"><tr><td></td></tr></table>'),
+        ])
+        self.assertEqual(slicer.feed('oun">Noun</h3><h4><span class="mw-headline" id="Translations">Translations'
+                                     '</span></h4><table class="translations"></table>'),
+                         [('noun', '<table class="translations"></table>')])
+
+    def test_scrape_translations(self):
+        with FixtureServer(compress=True) as server, Transport() as transport:
+            rows = list(scrape_translations('foobar', server.base_url('en'), transport))
+            typed = list(scrape_translations('foobar', server.base_url('en'), transport, typed=True))
+        self.assertEqual(rows, [row.to_dict() for row in typed])
+        self.assertEqual(typed, list(iter_translations([fixture_html('en', 'foobar')])))
+        self.assertEqual(len(server.requests), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import time
+import unittest
+from email.utils import formatdate
+from unittest.mock import patch
+
+from scraper import (CircuitOpenError, NO_RETRY, PageNotFoundError, RetryPolicy, Transport, TransientError,
+                     scrape_many)
+from scraper.transport import TokenBucket, parse_retry_after
+from tests.server import FixtureServer
+
+FAST_RETRY = RetryPolicy(retries=3, backoff=0.01)
+
+
+class TransportTestCase(unittest.TestCase):
+
+    def test_retries_server_errors(self):
+        with FixtureServer() as server, Transport(retry=FAST_RETRY) as transport:
+            server.inject_fault('complicated', 503, times=2)
+            html = transport.get_html(f'{server.base_url("en")}/wiki/complicated')
+        self.assertIn('complicated', html)
+        self.assertEqual(server.status_codes, [503, 503, 200])
+
+    def test_gives_up_after_retries(self):
+        with FixtureServer() as server, Transport(retry=FAST_RETRY) as transport:
+            server.inject_fault('complicated', 500, times=4)
+            with self.assertRaises(TransientError) as context:
+                transport.get_html(f'{server.base_url("en")}/wiki/complicated')
+        self.assertIsInstance(context.exception, FileNotFoundError)
+        self.assertEqual(context.exception.status_code, 500)
+        self.assertEqual(len(server.requests), 4)
+
+    def test_honors_retry_after(self):
+        with FixtureServer() as server, Transport(retry=FAST_RETRY) as transport:
+            server.inject_fault('complicated', 429, headers={'Retry-After': '7'})
+            with patch('scraper.transport.time.sleep') as sleep:
+                transport.get_html(f'{server.base_url("en")}/wiki/complicated')
+        sleep.assert_called_once_with(7.0)
+
+    def test_missing_page_is_not_retried(self):
+        with FixtureServer() as server, Transport(retry=FAST_RETRY) as transport:
+            with self.assertRaises(PageNotFoundError) as context:
+                transport.get_html(f'{server.base_url("en")}/wiki/missing')
+        self.assertEqual(context.exception.status_code, 404)
+        self.assertEqual(len(server.requests), 1)
+
+    def test_read_timeout(self):
+        with FixtureServer() as server, Transport(timeout=(1.0, 0.1), retry=NO_RETRY) as transport:
+            server.inject_fault('complicated', 200, delay=0.5)
+            with self.assertRaises(TransientError):
+                transport.get_html(f'{server.base_url("en")}/wiki/complicated')
+
+    def test_circuit_breaker(self):
+        with FixtureServer() as server, \
+                Transport(retry=NO_RETRY, failure_threshold=2, reset_timeout=0.1) as transport:
+            url = f'{server.base_url("en")}/wiki/complicated'
+            server.inject_fault('complicated', 503, times=3)
+            for _ in range(2):
+                with self.assertRaises(TransientError):
+                    transport.get_html(url)
+            with self.assertRaises(CircuitOpenError):
+                transport.get_html(url)
+            self.assertEqual(len(server.requests), 2)
+
+            # A failed trial request opens the circuit again, a successful one closes it
+            time.sleep(0.15)
+            with self.assertRaises(TransientError):
+                transport.get_html(url)
+            with self.assertRaises(CircuitOpenError):
+                transport.get_html(url)
+            time.sleep(0.15)
+            transport.get_html(url)
+            transport.get_html(url)
+        self.assertEqual(server.status_codes, [503, 503, 503, 200, 200])
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(requests_per_second=50, burst=1)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('3'), 3.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertAlmostEqual(parse_retry_after(formatdate(time.time() + 60, usegmt=True)), 60, delta=2)
+
+    def test_scrape_many_returns_errors(self):
+        with FixtureServer() as server, Transport(retry=NO_RETRY) as transport:
+            server.inject_fault('foobar', 503)
+            responses = list(scrape_many('en', 'en', ['complicated', 'missing', 'foobar'], transport=transport,
+                                         base_url=server.base_url('en'), return_errors=True))
+        self.assertNotIn('error', responses[0])
+        self.assertEqual(responses[1]['error'], 'not_found')
+        self.assertEqual(responses[2]['error'], 'transient')
+        self.assertEqual(responses[2]['meanings'], [])
+
+    def test_corrupt_body(self):
+        # A body which is not gzip although the response says so fails to decode
+        with FixtureServer() as server, Transport(retry=NO_RETRY) as transport:
+            server.inject_fault('foobar', 200, headers={'Content-Encoding': 'gzip'})
+            responses = list(scrape_many('en', 'en', ['foobar', 'complicated'], transport=transport,
+                                         base_url=server.base_url('en'), return_errors=True))
+        self.assertEqual(responses[0]['error'], 'transient')
+        self.assertNotIn('error', responses[1])
+
+        with FixtureServer() as server, \
+                Transport(retry=NO_RETRY, failure_threshold=2, reset_timeout=60) as transport:
+            server.inject_fault('foobar', 200, times=2, headers={'Content-Encoding': 'gzip'})
+            for _ in range(2):
+                with self.assertRaises(TransientError):
+                    transport.get_html(f'{server.base_url("en")}/wiki/foobar')
+            with self.assertRaises(CircuitOpenError):
+                transport.get_html(f'{server.base_url("en")}/wiki/foobar')
+
+    def test_undecodable_body(self):
+        with FixtureServer() as server, \
+                Transport(retry=FAST_RETRY, failure_threshold=1, reset_timeout=60) as transport:
+            server.inject_fault('foobar', 200, body=b'\xff\xfe')
+            responses = list(scrape_many('en', 'en', ['foobar'], transport=transport,
+                                         base_url=server.base_url('en'), return_errors=True))
+            self.assertEqual(responses[0]['error'], 'failed')
+            # It is not retried, but the host is not trusted until the breaker lets a request through again
+            self.assertEqual(len(server.requests), 1)
+            with self.assertRaises(CircuitOpenError):
+                transport.get_html(f'{server.base_url("en")}/wiki/foobar')
+
+
+
+if __name__ == '__main__':
+    unittest.main()
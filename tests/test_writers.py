@@ -0,0 +1,85 @@
+import csv
+import gzip
+import json
+import tempfile
+import unittest
+from importlib.util import find_spec
+from pathlib import Path
+
+from scraper import ColumnarWriter, JsonLinesWriter, scrape_html, write_responses
+from scraper.writers import flatten
+from tests.mock import fixture_html
+
+
+def fixture_responses():
+    return [scrape_html(from_language, to_language, word,
+                        fixture_html(to_language, word))
+            for from_language, to_language, word in [('en', 'en', 'complicated'), ('en', 'en', 'foobar'),
+                                                     ('tr', 'en', 'araba')]]
+
+
+class WritersTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.responses = fixture_responses()
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = Path(self._directory.name)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_json_lines(self):
+        path = self.directory / 'responses.jsonl.gz'
+        with JsonLinesWriter(path, batch_size=2) as writer:
+            self.assertEqual(write_responses(self.responses, writer), 3)
+        with gzip.open(path, 'rt', encoding='utf-8') as file:
+            self.assertEqual([json.loads(line) for line in file], self.responses)
+
+    @unittest.skipUnless(find_spec('zstandard'), 'zstandard is not installed')
+    def test_json_lines_zstd(self):
+        import zstandard
+        path = self.directory / 'responses.jsonl.zst'
+        with JsonLinesWriter(path) as writer:
+            write_responses(self.responses, writer)
+        with zstandard.open(path, 'rt', encoding='utf-8') as file:
+            self.assertEqual([json.loads(line) for line in file], self.responses)
+
+    def test_flatten(self):
+        tables = flatten(self.responses[0])
+        self.assertEqual(len(tables['meanings']), 2)
+        self.assertEqual(tables['meanings'][0]['antonyms'], ['simple'])
+        self.assertEqual(len(tables['definitions']), 3)
+        self.assertEqual(tables['definitions'][2]['meaning_index'], 1)
+        self.assertEqual(len(tables['examples']), 2)
+        self.assertEqual(tables['examples'][1]['definition_index'], 0)
+        self.assertEqual(len(tables['pronunciations']), 5)
+        self.assertEqual(tables['pronunciations'][2]['type'], 'Hyphenation')
+
+    def test_columnar_csv(self):
+        with ColumnarWriter(self.directory, batch_size=2) as writer:
+            write_responses(self.responses, writer)
+        expected = {table: [] for table in ['meanings', 'definitions', 'examples', 'pronunciations']}
+        for response in self.responses:
+            for table, rows in flatten(response).items():
+                expected[table].extend(rows)
+        for table, rows in expected.items():
+            with open(self.directory / f'{table}.csv', encoding='utf-8', newline='') as file:
+                written = list(csv.DictReader(file))
+            self.assertEqual(len(written), len(rows))
+            self.assertEqual([row['word'] for row in written], [row['word'] for row in rows])
+
+    @unittest.skipUnless(find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_columnar_parquet(self):
+        import pyarrow.parquet
+        with ColumnarWriter(self.directory, file_format='parquet', batch_size=2) as writer:
+            write_responses(self.responses, writer)
+        parquet_file = pyarrow.parquet.ParquetFile(self.directory / 'definitions.parquet')
+        self.assertEqual(parquet_file.metadata.num_row_groups, 2)
+        definitions = parquet_file.read().to_pylist()
+        expected = [row for response in self.responses for row in flatten(response)['definitions']]
+        self.assertEqual(definitions, expected)
+        meanings = pyarrow.parquet.read_table(self.directory / 'meanings.parquet').to_pylist()
+        self.assertEqual(meanings[0]['antonyms'], ['simple'])